@@ -0,0 +1,133 @@
+"""
+Comparación de los backends del paso de la población.
+
+Juega las mismas generaciones (misma semilla) con cada backend disponible:
+- comprueba frame a frame que el estado de la población (posición, salto,
+  vida, score, entradas y salidas de la red) es idéntico al del backend
+  numpy de referencia
+- mide los frames por segundo de cada backend por separado
+
+Sale con código 1 si algún backend se separa de la referencia.
+
+Uso:
+    python -m benchmarks.bench_backends --sizes 500 5000 --generations 3
+"""
+import os
+import sys
+import argparse
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+POPULATION_SIZES = [500, 5000]
+GENERATIONS = 3
+SEED = 0
+
+# Arrays de la red que también deben coincidir
+BRAIN_FIELDS = ("hidden_outputs", "outputs")
+
+
+def first_difference(reference, other):
+    """
+    Busca el primer array de la población que no coincide entre dos simulaciones.
+    
+    Returns:
+        str: nombre del array distinto, o None si son idénticas
+    """
+    for field in reference.population.STATE_FIELDS:
+        if not np.array_equal(getattr(reference.population, field), getattr(other.population, field)):
+            return field
+    for field in BRAIN_FIELDS:
+        if not np.array_equal(getattr(reference.population.brain, field),
+                              getattr(other.population.brain, field)):
+            return "brain." + field
+    if reference.generation_data != other.generation_data:
+        return "generation_data"
+    return None
+
+
+def check_equivalence(name, size, generations, seed):
+    """
+    Juega en paralelo una simulación numpy y otra con el backend indicado,
+    comparando el estado después de cada frame.
+    
+    Returns:
+        tuple: (frames comparados, descripción de la primera diferencia o None)
+    """
+    from game.simulation import Simulation
+    reference = Simulation(fixed_timestep=True, population_size=size, seed=seed, backend="numpy")
+    other = Simulation(fixed_timestep=True, population_size=size, seed=seed, backend=name)
+    frames = 0
+    while reference.generation <= generations:
+        reference.step()
+        other.step()
+        frames += 1
+        field = first_difference(reference, other)
+        if field is not None:
+            return frames, f"{field} distinto en el frame {frames} (generación {reference.generation})"
+    return frames, None
+
+
+def measure(name, size, generations, seed):
+    """
+    Mide los frames por segundo de un backend.
+    
+    Returns:
+        float: frames por segundo
+    """
+    from game.simulation import Simulation
+    simulation = Simulation(fixed_timestep=True, population_size=size, seed=seed, backend=name)
+    # Un frame de calentamiento (compilación del backend numba)
+    simulation.update_frame()
+    simulation = Simulation(fixed_timestep=True, population_size=size, seed=seed, backend=name)
+    simulation.profiler.enabled = True
+    for _ in range(generations):
+        simulation.run_generation()
+    frames = simulation.profiler.totals()["frame"]
+    return frames.count / (frames.total_ns / 1e9)
+
+
+def parse_args():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Equivalencia y rendimiento de los backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=POPULATION_SIZES,
+                        help="tamaños de población a medir")
+    parser.add_argument("--generations", type=int, default=GENERATIONS,
+                        help="generaciones por tamaño")
+    parser.add_argument("--seed", type=int, default=SEED, help="semilla de la simulación")
+    return parser.parse_args()
+
+
+def main():
+    """Comprueba y mide cada backend disponible."""
+    from game.backends import BACKENDS, numba_available
+    args = parse_args()
+    backends = [name for name in BACKENDS if name != "numba" or numba_available()]
+    if not numba_available():
+        print("AVISO - Numba no está instalado: solo se mide el backend numpy")
+    
+    failures = []
+    print(f"{'poblacion':>10} {'backend':>8} {'frames/s':>10} {'frames comparados':>18}")
+    for size in args.sizes:
+        for name in backends:
+            compared = "-"
+            if name != "numpy":
+                frames, difference = check_equivalence(name, size, args.generations, args.seed)
+                compared = str(frames)
+                if difference:
+                    failures.append(f"{name} con {size} dinosaurios: {difference}")
+            fps = measure(name, size, args.generations, args.seed)
+            print(f"{size:>10} {name:>8} {fps:10.1f} {compared:>18}")
+    
+    if failures:
+        print("\nERROR - Backends distintos de la referencia:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nOK - Todos los backends son idénticos a numpy")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Benchmark del entorno por lotes (DinoEnv) frente al bucle del algoritmo genético.
+
+Juega los mismos recorridos con los mismos cerebros de dos formas:
+- ga: Simulation.play_generation (sensores, red y física dentro del núcleo)
+- env: DinoEnv.step con la red evaluada fuera, como haría otro optimizador
+y mide pasos de dinosaurio por segundo (frames x dinosaurios vivos). Los
+dos modos juegan exactamente los mismos frames con el paso de NumPy
+(DinoEnv no usa el backend numba), así que la diferencia entre ambos es
+el coste de la API del entorno.
+
+Uso:
+    python -m benchmarks.bench_environment --sizes 500 5000
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+POPULATION_SIZES = [500, 5000, 50000]
+EPISODES = 3
+SEED = 0
+# Backend del modo ga: el mismo paso de NumPy que usa DinoEnv
+BACKEND = "numpy"
+
+
+def run_ga(size, episodes, seed):
+    """
+    Juega varias generaciones con el bucle de la simulación, sin reproducir.
+    
+    Returns:
+        float: segundos
+    """
+    from game.simulation import Simulation
+    elapsed = 0.0
+    population = Simulation(fixed_timestep=True, population_size=size, seed=seed,
+                            backend=BACKEND).population
+    for episode in range(1, episodes + 1):
+        simulation = Simulation(fixed_timestep=True, seed=seed, generation=episode,
+                                population=population.select(np.arange(size)), backend=BACKEND)
+        start = time.perf_counter()
+        simulation.play_generation()
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def run_env(size, episodes, seed):
+    """
+    Juega los mismos episodios con DinoEnv y los cerebros de la población como política.
+    
+    Returns:
+        tuple: (pasos de dinosaurio, segundos)
+    """
+    from game.environment import DinoEnv
+    env = DinoEnv(size, seed=seed)
+    observations = env.reset()
+    brain = env.population.brain
+    actions = np.zeros((size, 2))
+    steps = 0
+    start = time.perf_counter()
+    for episode in range(episodes):
+        if episode:
+            observations = env.reset()
+        while not env.all_done():
+            alive = env.population.alive_indices()
+            steps += len(alive)
+            actions[alive] = brain.feed_forward(observations[alive], alive)
+            observations, rewards, dones, info = env.step(actions)
+    return steps, time.perf_counter() - start
+
+
+def parse_args():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmark de DinoEnv frente al algoritmo genético")
+    parser.add_argument("--sizes", type=int, nargs="+", default=POPULATION_SIZES,
+                        help="dinosaurios por episodio")
+    parser.add_argument("--episodes", type=int, default=EPISODES, help="episodios por tamaño")
+    parser.add_argument("--seed", type=int, default=SEED, help="semilla de los recorridos")
+    return parser.parse_args()
+
+
+def main():
+    """Ejecuta el benchmark e imprime los pasos por segundo de cada modo."""
+    args = parse_args()
+    print(f"backend del modo ga: {BACKEND}")
+    print(f"{'poblacion':>10} {'ga (pasos/s)':>14} {'env (pasos/s)':>14} {'env / ga':>9}")
+    for size in args.sizes:
+        ga_seconds = run_ga(size, args.episodes, args.seed)
+        env_steps, env_seconds = run_env(size, args.episodes, args.seed)
+        ga_rate = env_steps / ga_seconds
+        env_rate = env_steps / env_seconds
+        print(f"{size:>10} {ga_rate:14.0f} {env_rate:14.0f} {env_rate / ga_rate:9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Verificación y benchmark de los kernels de utils.linear_algebra.
+
+Primero comprueba que las versiones vectorizadas dan exactamente los mismos
+resultados que matrix_vector_multiplication (la versión con bucles), y
+después mide la aceleración en los tamaños que usa Brain (7x7 y 2x7) y con
+lotes de hasta 100k dinosaurios.
+
+Uso:
+    python -m benchmarks.bench_linear_algebra
+"""
+import sys
+import timeit
+import numpy as np
+
+from utils.linear_algebra import (
+    matrix_vector_multiplication, vectorized_matrix_vector_multiplication,
+    batched_matrix_vector_multiplication, add_bias_relu
+)
+
+
+# Tamaños de las capas de Brain (filas, columnas)
+LAYER_SHAPES = [(7, 7), (2, 7)]
+BATCH_SIZES = [1, 100, 1000, 10000, 100000]
+# Filas con las que se mide (y extrapola) la versión con bucles en lotes grandes
+REFERENCE_ROWS = 200
+
+
+def reference_add_bias_relu(values, bias):
+    """Suma de bias y ReLU elemento a elemento, como hacía Brain.feed_forward."""
+    result = values.copy()
+    for i in range(len(result)):
+        result[i] += bias[i]
+        result[i] = max(0, result[i])
+    return result
+
+
+def check_equivalence(rng):
+    """
+    Comprueba que los kernels vectorizados coinciden bit a bit con la referencia.
+    
+    Returns:
+        list: descripción de cada discrepancia encontrada
+    """
+    errors = []
+    for rows, cols in LAYER_SHAPES:
+        for _ in range(200):
+            # Pesos dispersos como los que construye el genoma
+            matrix = rng.uniform(-1, 1, (rows, cols)) * (rng.random((rows, cols)) < 0.3)
+            vector = rng.uniform(-1.5, 1.5, cols)
+            bias = rng.uniform(-1, 1, rows)
+            expected = matrix_vector_multiplication(matrix, vector)
+            
+            if not np.array_equal(vectorized_matrix_vector_multiplication(matrix, vector), expected):
+                errors.append(f"vectorized_matrix_vector_multiplication {rows}x{cols}")
+            out = np.empty(rows)
+            vectorized_matrix_vector_multiplication(matrix, vector, out=out)
+            if not np.array_equal(out, expected):
+                errors.append(f"vectorized_matrix_vector_multiplication(out=) {rows}x{cols}")
+            if not np.array_equal(add_bias_relu(expected, bias), reference_add_bias_relu(expected, bias)):
+                errors.append(f"add_bias_relu {rows}")
+        
+        matrices = rng.uniform(-1, 1, (1000, rows, cols)) * (rng.random((1000, rows, cols)) < 0.3)
+        vectors = rng.uniform(-1.5, 1.5, (1000, cols))
+        expected = np.array([matrix_vector_multiplication(m, v) for m, v in zip(matrices, vectors)])
+        if not np.array_equal(batched_matrix_vector_multiplication(matrices, vectors), expected):
+            errors.append(f"batched_matrix_vector_multiplication {rows}x{cols}")
+        out = np.empty((1000, rows))
+        batched_matrix_vector_multiplication(matrices, vectors, out=out)
+        if not np.array_equal(out, expected):
+            errors.append(f"batched_matrix_vector_multiplication(out=) {rows}x{cols}")
+    return errors
+
+
+def best_time(function, repeat=5):
+    """Mejor tiempo (en segundos) de una llamada a function."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def benchmark_single(rng):
+    """Mide un producto matriz-vector suelto en los tamaños de Brain."""
+    print("Producto matriz-vector (un dinosaurio)")
+    print(f"{'capa':>6} {'bucles (us)':>12} {'vectorizado (us)':>17} {'out= (us)':>10} {'mejora':>8}")
+    for rows, cols in LAYER_SHAPES:
+        matrix = rng.uniform(-1, 1, (rows, cols))
+        vector = rng.uniform(-1, 1, cols)
+        out = np.empty(rows)
+        loops = best_time(lambda: matrix_vector_multiplication(matrix, vector))
+        vectorized = best_time(lambda: vectorized_matrix_vector_multiplication(matrix, vector))
+        preallocated = best_time(lambda: vectorized_matrix_vector_multiplication(matrix, vector, out=out))
+        print(f"{rows}x{cols:<4} {loops * 1e6:12.2f} {vectorized * 1e6:17.2f} "
+              f"{preallocated * 1e6:10.2f} {loops / preallocated:7.1f}x")
+
+
+def benchmark_batched(rng):
+    """Mide la capa completa (producto + bias + ReLU) para lotes de dinosaurios."""
+    print("\nCapa completa por lote (producto + bias + ReLU)")
+    print(f"{'capa':>6} {'lote':>7} {'bucles (ms)':>12} {'lote (ms)':>10} {'out= (ms)':>10} {'mejora':>8}")
+    for rows, cols in LAYER_SHAPES:
+        for batch in BATCH_SIZES:
+            matrices = rng.uniform(-1, 1, (batch, rows, cols))
+            vectors = rng.uniform(-1, 1, (batch, cols))
+            biases = rng.uniform(-1, 1, (batch, rows))
+            out = np.empty((batch, rows))
+            
+            # La versión con bucles se mide sobre pocas filas y se extrapola
+            sample = min(batch, REFERENCE_ROWS)
+            
+            def loops():
+                for i in range(sample):
+                    reference_add_bias_relu(matrix_vector_multiplication(matrices[i], vectors[i]), biases[i])
+            
+            def batched():
+                add_bias_relu(batched_matrix_vector_multiplication(matrices, vectors), biases)
+            
+            def preallocated():
+                batched_matrix_vector_multiplication(matrices, vectors, out=out)
+                add_bias_relu(out, biases, out=out)
+            
+            loops_time = best_time(loops, repeat=3) * batch / sample
+            batched_time = best_time(batched, repeat=3)
+            preallocated_time = best_time(preallocated, repeat=3)
+            print(f"{rows}x{cols:<4} {batch:7d} {loops_time * 1e3:12.3f} {batched_time * 1e3:10.3f} "
+                  f"{preallocated_time * 1e3:10.3f} {loops_time / preallocated_time:7.0f}x")
+
+
+def main():
+    """Verifica la equivalencia numérica y ejecuta los benchmarks."""
+    rng = np.random.default_rng(0)
+    
+    errors = check_equivalence(rng)
+    if errors:
+        print("ERROR - Los kernels vectorizados no coinciden con la referencia:")
+        for error in errors:
+            print(f"  - {error}")
+        return 1
+    print("OK - Los kernels vectorizados coinciden bit a bit con la referencia\n")
+    
+    benchmark_single(rng)
+    benchmark_batched(rng)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
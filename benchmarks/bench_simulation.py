@@ -0,0 +1,224 @@
+"""
+Benchmark de rendimiento de la simulación completa.
+
+Ejecuta Simulation en modo headless (paso fijo y semilla fija) con varios
+tamaños de población y mide:
+- frames por segundo
+- generaciones por minuto
+- tiempo medio de next_generation
+- memoria máxima (RSS) del proceso
+
+Cada medición corre en un proceso nuevo para que la memoria máxima de una
+no contamine la siguiente, y de varias repeticiones se queda el mejor valor
+de cada métrica para reducir el ruido. Los resultados se guardan en JSON y se pueden
+comparar contra un baseline guardado para detectar regresiones.
+
+Uso:
+    python -m benchmarks.bench_simulation --output resultados.json
+    python -m benchmarks.bench_simulation --sizes 100 500 --baseline resultados.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import multiprocessing
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+POPULATION_SIZES = [100, 500, 5000, 50000]
+GENERATIONS = 3
+REPEAT = 3
+SEED = 0
+TOLERANCE = 0.10
+
+# Métrica -> True si un valor mayor es mejor
+METRICS = {
+    "frames_per_second": True,
+    "generations_per_minute": True,
+    "next_generation_ms": False,
+    "peak_rss_mb": False,
+}
+
+
+def peak_rss_mb():
+    """Memoria máxima (RSS) del proceso en MB, o None si no se puede medir."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux da KB y macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(size, generations, seed, backend="auto"):
+    """
+    Juega varias generaciones con una población y mide su rendimiento.
+    
+    Args:
+        size: dinosaurios por generación
+        generations: generaciones a jugar
+        seed: semilla de la simulación
+        backend: backend del paso de la población
+    
+    Returns:
+        dict: métricas de la ejecución
+    """
+    from game.simulation import Simulation
+    simulation = Simulation(fixed_timestep=True, population_size=size, seed=seed, backend=backend)
+    simulation.profiler.enabled = True
+    
+    start = time.perf_counter()
+    for _ in range(generations):
+        simulation.run_generation()
+    elapsed = time.perf_counter() - start
+    
+    totals = simulation.profiler.totals()
+    frames = totals["frame"]
+    next_generation = totals["next_generation"]
+    return {
+        "population": size,
+        "backend": simulation.backend.name,
+        "generations": generations,
+        "frames": frames.count,
+        "seconds": elapsed,
+        "frames_per_second": frames.count / (frames.total_ns / 1e9),
+        "generations_per_minute": generations / elapsed * 60,
+        "next_generation_ms": next_generation.total_ns / next_generation.count / 1e6,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_isolated(size, generations, seed, backend="auto"):
+    """Ejecuta run_benchmark en un proceso nuevo (memoria máxima independiente)."""
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(run_benchmark, (size, generations, seed, backend))
+
+
+def best_of(runs):
+    """
+    Combina varias repeticiones quedándose con el mejor valor de cada métrica.
+    
+    Args:
+        runs: lista de resultados de run_benchmark
+    
+    Returns:
+        dict: resultado combinado
+    """
+    best = dict(runs[0])
+    best["seconds"] = min(run["seconds"] for run in runs)
+    for metric, higher_is_better in METRICS.items():
+        values = [run[metric] for run in runs if run[metric] is not None]
+        if values:
+            best[metric] = max(values) if higher_is_better else min(values)
+    best["repeat"] = len(runs)
+    return best
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compara los resultados con un baseline.
+    
+    Args:
+        results: dict de resultados por tamaño
+        baseline: dict de resultados por tamaño del baseline
+        tolerance: empeoramiento relativo permitido (0.10 = 10%)
+    
+    Returns:
+        list: descripción de cada regresión encontrada
+    """
+    regressions = []
+    print(f"\n{'poblacion':>10} {'metrica':>24} {'baseline':>12} {'actual':>12} {'cambio':>8}")
+    for size, current in results.items():
+        previous = baseline.get(size)
+        if previous is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = "  REGRESION" if worse > tolerance else ""
+            print(f"{size:>10} {metric:>24} {old:12.2f} {new:12.2f} {change * 100:+7.1f}%{flag}")
+            if flag:
+                regressions.append(f"{metric} con {size} dinosaurios: {old:.2f} -> {new:.2f}")
+    return regressions
+
+
+def parse_args():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmark de la simulación completa")
+    parser.add_argument("--sizes", type=int, nargs="+", default=POPULATION_SIZES,
+                        help="tamaños de población a medir")
+    parser.add_argument("--generations", type=int, default=GENERATIONS,
+                        help="generaciones por tamaño")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help="repeticiones por tamaño (se guarda la mejor)")
+    parser.add_argument("--seed", type=int, default=SEED, help="semilla de la simulación")
+    parser.add_argument("--backend", choices=["auto", "numpy", "numba"], default="auto",
+                        help="backend del paso de la población")
+    parser.add_argument("--output", default=None, help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", default=None, help="archivo JSON de resultados anteriores")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="empeoramiento relativo permitido antes de marcar regresión")
+    return parser.parse_args()
+
+
+def main():
+    """Ejecuta el benchmark y, si se pide, lo compara con un baseline."""
+    args = parse_args()
+    
+    print(f"{'poblacion':>10} {'frames':>8} {'frames/s':>10} {'gen/min':>9} "
+          f"{'next_gen (ms)':>14} {'RSS (MB)':>9}")
+    results = {}
+    for size in args.sizes:
+        result = best_of([run_isolated(size, args.generations, args.seed, args.backend)
+                          for _ in range(args.repeat)])
+        results[str(size)] = result
+        rss = "-" if result["peak_rss_mb"] is None else f"{result['peak_rss_mb']:.1f}"
+        print(f"{size:>10} {result['frames']:>8} {result['frames_per_second']:10.1f} "
+              f"{result['generations_per_minute']:9.2f} {result['next_generation_ms']:14.2f} {rss:>9}")
+    
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "generations": args.generations,
+        "seed": args.seed,
+        "backend": args.backend,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResultados guardados en {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("generations") != args.generations or baseline.get("seed") != args.seed:
+            print("\nAVISO - El baseline se midió con otras generaciones o semilla")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print("\nERROR - Regresiones de rendimiento:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print("\nOK - Sin regresiones respecto al baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
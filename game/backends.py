@@ -0,0 +1,245 @@
+"""
+Backends de cálculo del paso de la población en cada frame: sensores,
+red neuronal, saltar/agacharse y colisiones de todos los dinosaurios vivos.
+
+- numpy: implementación de referencia con operaciones sobre arrays
+- numba: un kernel compilado que hace sensores, red y física de cada
+  dinosaurio en una sola pasada, sin arrays temporales. Necesita Numba
+  (opcional); si no está instalado se usa numpy automáticamente.
+
+Los dos backends producen exactamente el mismo estado frame a frame.
+"""
+import warnings
+import numpy as np
+from game.obstacles import NO_OBSTACLE_DISTANCE, COURSE_KEY_SPAN
+from game.collisions import collision_mask
+from game.population import (DINO_GROUND_Y, DINO_CROUCH_Y, DINO_WIDTH, DINO_HEIGHT,
+                             DINO_CROUCH_WIDTH, DINO_CROUCH_HEIGHT, JUMP_Y_POS, JUMP_FRAMES)
+
+try:
+    import numba
+except ImportError:  # Numba es opcional
+    numba = None
+
+
+# Backend por defecto: el compilado si Numba está disponible
+DEFAULT_BACKEND = "auto"
+
+
+class NumpyBackend:
+    """Backend de referencia: el paso de Population con operaciones de NumPy."""
+    
+    name = "numpy"
+    
+    def update(self, population, indices, obstacles, speed, courses=None):
+        """
+        Lee los sensores, evalúa la red y ejecuta las acciones de un frame.
+        
+        Args:
+            population: Population
+            indices: dinosaurios vivos
+            obstacles: ObstacleIndex de los enemigos en pantalla
+            speed: velocidad actual del juego (entera)
+            courses: recorrido de cada dinosaurio indicado (obligatorio si
+                obstacles se creó con varios recorridos)
+        """
+        next_obstacles_info = obstacles.next_obstacles_info(population.x_pos[indices],
+                                                            dinos_courses=courses)
+        population.update(next_obstacles_info, speed, indices)
+    
+    def collisions(self, population, indices, boxes, courses=None, boxes_courses=None):
+        """
+        Args:
+            population: Population
+            indices: dinosaurios vivos
+            boxes: numpy array (m, 4) de enemy_boxes
+            courses: recorrido de cada dinosaurio indicado (opcional)
+            boxes_courses: recorrido de cada caja (de course_boxes)
+        
+        Returns:
+            numpy array bool (n,): True para los dinosaurios que colisionan
+        """
+        return collision_mask(population, indices, boxes, courses, boxes_courses)
+
+
+class NumbaBackend:
+    """
+    Backend compilado con Numba: recorre los dinosaurios vivos una sola vez
+    por frame y hace todo su paso sin crear arrays intermedios. Las
+    operaciones en coma flotante siguen el mismo orden que NumpyBackend.
+    """
+    
+    name = "numba"
+    
+    def update(self, population, indices, obstacles, speed, courses=None):
+        """Igual que NumpyBackend.update (un solo recorrido o varios)."""
+        brain = population.brain
+        brain_rows = indices if population.brain_rows is None else population.brain_rows[indices]
+        if obstacles.courses is None:
+            # Un solo recorrido: todos en el 0 (la clave de búsqueda es la x)
+            courses = np.zeros(len(indices), dtype=np.int64)
+            obstacles_courses = np.zeros(len(obstacles) + 1, dtype=np.int64)
+            obstacles_courses[-1] = -1
+        else:
+            courses = np.asarray(courses, dtype=np.int64)
+            obstacles_courses = obstacles.courses
+        _update_dinos(indices, brain_rows, courses, obstacles.x_pos, obstacles.table,
+                      obstacles_courses, speed,
+                      population.x_pos, population.y_pos, population.obj_width,
+                      population.obj_height, population.jump_frame, population.sprite_frame,
+                      population.brain_inputs, brain.hidden_layer_weights,
+                      brain.output_layer_weights, brain.hidden_layer_bias,
+                      brain.output_layer_bias, brain.hidden_outputs, brain.outputs)
+    
+    def collisions(self, population, indices, boxes, courses=None, boxes_courses=None):
+        """Igual que NumpyBackend.collisions."""
+        if courses is None:
+            courses = np.zeros(len(indices), dtype=np.int64)
+            boxes_courses = np.zeros(len(boxes), dtype=np.int64)
+        return _collision_mask(indices, np.asarray(courses, dtype=np.int64), population.x_pos,
+                               population.y_pos, population.obj_width, population.obj_height,
+                               boxes, np.asarray(boxes_courses, dtype=np.int64))
+
+
+# Nombre -> backend
+BACKENDS = {
+    "numpy": NumpyBackend,
+    "numba": NumbaBackend,
+}
+
+
+def numba_available():
+    """True si Numba está instalado."""
+    return numba is not None
+
+
+def get_backend(name=DEFAULT_BACKEND):
+    """
+    Crea un backend por nombre.
+    
+    Args:
+        name: "numpy", "numba" o "auto" (numba si está disponible, si no numpy)
+    
+    Returns:
+        NumpyBackend o NumbaBackend
+    """
+    if name == "auto":
+        name = "numba" if numba_available() else "numpy"
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {name}")
+    if name == "numba" and not numba_available():
+        warnings.warn("Numba no está instalado: se usa el backend numpy")
+        name = "numpy"
+    return BACKENDS[name]()
+
+
+def _jit(function):
+    """Compila la función con Numba si está disponible (si no, queda sin usar)."""
+    if numba is None:
+        return function
+    return numba.njit(cache=True)(function)
+
+
+@_jit
+def _update_dinos(indices, brain_rows, courses, obstacles_x, obstacles_table, obstacles_courses,
+                  speed, x_pos, y_pos, obj_width, obj_height, jump_frame, sprite_frame,
+                  brain_inputs, hidden_weights, output_weights, hidden_bias, output_bias,
+                  hidden_outputs, outputs):
+    """Sensores, red neuronal y física de un frame para cada dinosaurio indicado."""
+    obstacles_count = len(obstacles_x)
+    hidden_size = hidden_weights.shape[1]
+    inputs_size = hidden_weights.shape[2]
+    hidden = np.empty(hidden_size)
+    
+    for n in range(len(indices)):
+        i = indices[n]
+        row = brain_rows[n]
+        
+        # Sensores: primer obstáculo de su recorrido con x mayor (fila extra
+        # de ceros si no hay)
+        key = courses[n] * COURSE_KEY_SPAN + x_pos[i]
+        following = np.searchsorted(obstacles_x, key, side="right")
+        if following < obstacles_count and obstacles_courses[following] == courses[n]:
+            distance = obstacles_table[following, 0] - x_pos[i]
+        else:
+            following = obstacles_count
+            distance = NO_OBSTACLE_DISTANCE
+        inputs = brain_inputs[i]
+        inputs[0] = distance / 900
+        inputs[1] = (obstacles_table[following, 0] - 450) / (1350 - 450)
+        inputs[2] = (obstacles_table[following, 1] - 370) / (480 - 370)
+        inputs[3] = (obstacles_table[following, 2] - 30) / (146 - 30)
+        inputs[4] = (obstacles_table[following, 3] - 40) / (96 - 40)
+        inputs[5] = (y_pos[i] - 278) / (484 - 278)
+        inputs[6] = (speed - 15) / (30 - 15)
+        
+        # Red neuronal (columnas acumuladas en el mismo orden que NumPy)
+        for r in range(hidden_size):
+            value = hidden_weights[row, r, 0] * inputs[0]
+            for j in range(1, inputs_size):
+                value += hidden_weights[row, r, j] * inputs[j]
+            value = value + hidden_bias[row, r]
+            if value < 0:
+                value = 0.0
+            hidden[r] = value
+            hidden_outputs[row, r] = value
+        for r in range(output_weights.shape[1]):
+            value = output_weights[row, r, 0] * hidden[0]
+            for j in range(1, hidden_size):
+                value += output_weights[row, r, j] * hidden[j]
+            value = value + output_bias[row, r]
+            if value < 0:
+                value = 0.0
+            outputs[row, r] = value
+        wants_jump = outputs[row, 0] != 0
+        wants_crouch = outputs[row, 1] != 0
+        
+        # Saltar
+        if wants_jump and obj_width[i] != DINO_CROUCH_WIDTH and jump_frame[i] == 0:
+            jump_frame[i] = 1
+            sprite_frame[i] = 0
+        
+        # Dejar de agacharse
+        if not wants_crouch and obj_width[i] == DINO_CROUCH_WIDTH:
+            y_pos[i] = DINO_GROUND_Y
+            obj_width[i] = DINO_WIDTH
+            obj_height[i] = DINO_HEIGHT
+            sprite_frame[i] = 0
+        
+        # Agacharse (interrumpe el salto)
+        if wants_crouch:
+            if jump_frame[i] > 0:
+                jump_frame[i] = 0
+                y_pos[i] = DINO_GROUND_Y
+                sprite_frame[i] = 0
+            if obj_width[i] != DINO_CROUCH_WIDTH:
+                y_pos[i] = DINO_CROUCH_Y
+                obj_width[i] = DINO_CROUCH_WIDTH
+                obj_height[i] = DINO_CROUCH_HEIGHT
+                sprite_frame[i] = 0
+        
+        # Física del salto
+        if jump_frame[i] > 0:
+            y_pos[i] = JUMP_Y_POS[jump_frame[i] - 1]
+            jump_frame[i] += 1
+            if jump_frame[i] > JUMP_FRAMES:
+                jump_frame[i] = 0
+                y_pos[i] = DINO_GROUND_Y
+                sprite_frame[i] = 0
+
+
+@_jit
+def _collision_mask(indices, courses, x_pos, y_pos, obj_width, obj_height, boxes, boxes_courses):
+    """Test AABB de cada dinosaurio indicado contra las cajas de los enemigos de su recorrido."""
+    colliding = np.zeros(len(indices), dtype=np.bool_)
+    for n in range(len(indices)):
+        i = indices[n]
+        for box in range(len(boxes)):
+            if (courses[n] == boxes_courses[box] and
+                    x_pos[i] + obj_width[i] > boxes[box, 0] and
+                    x_pos[i] < boxes[box, 0] + boxes[box, 2] and
+                    y_pos[i] + obj_height[i] > boxes[box, 1] and
+                    y_pos[i] < boxes[box, 1] + boxes[box, 3]):
+                colliding[n] = True
+                break
+    return colliding
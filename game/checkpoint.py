@@ -0,0 +1,142 @@
+"""
+Checkpoints de la simulación en un único archivo .npz.
+
+Un checkpoint guarda la generación en curso tal y como empieza: genomas,
+bias y posición x de cada dinosaurio, el mejor dinosaurio visto, el estado
+de los flujos aleatorios y las estadísticas de las generaciones anteriores.
+Al reanudar, la generación vuelve a jugarse desde el principio; con paso
+fijo el resultado es idéntico al de una ejecución sin interrupciones.
+"""
+import os
+import json
+import numpy as np
+from game.dino import Dino
+from game.population import Population
+from game.simulation import Simulation, TOURNAMENT_SIZE
+from neural_network.genome import GenomeBatch
+
+
+# Versión del formato (cambiarla si cambian los arrays guardados)
+CHECKPOINT_VERSION = 1
+
+
+def population_arrays(population, prefix):
+    """
+    Arrays que definen una población al inicio de una generación.
+    
+    Args:
+        population: Population
+        prefix: prefijo de los nombres dentro del archivo
+    
+    Returns:
+        dict: nombre -> numpy array
+    """
+    genomes = population.genomes
+    return {
+        prefix + "genes": genomes.genes,
+        prefix + "hidden_layer_bias": genomes.hidden_layer_bias,
+        prefix + "output_layer_bias": genomes.output_layer_bias,
+        prefix + "x_pos": population.x_pos,
+    }
+
+
+def population_from_arrays(arrays, prefix):
+    """
+    Reconstruye una población guardada con population_arrays.
+    
+    Args:
+        arrays: archivo .npz abierto
+        prefix: prefijo de los nombres dentro del archivo
+    
+    Returns:
+        Population: población lista para empezar la generación
+    """
+    genomes = GenomeBatch(arrays[prefix + "genes"], arrays[prefix + "hidden_layer_bias"],
+                          arrays[prefix + "output_layer_bias"])
+    population = Population(len(genomes), genomes)
+    population.x_pos = arrays[prefix + "x_pos"]
+    return population
+
+
+def save_checkpoint(simulation, path):
+    """
+    Guarda la simulación en un archivo .npz.
+    El archivo se escribe primero a un temporal y luego se renombra, así un
+    corte a mitad de escritura nunca deja un checkpoint corrupto.
+    
+    Args:
+        simulation: Simulation a guardar
+        path: ruta del archivo
+    """
+    arrays = population_arrays(simulation.population, "population_")
+    if simulation.best_dino_alive is not None:
+        arrays.update(population_arrays(simulation.best_dino_alive.population, "best_"))
+    
+    metadata = {
+        "version": CHECKPOINT_VERSION,
+        # La semilla puede tener más de 64 bits: se guarda como texto
+        "seed": str(simulation.seed),
+        "generation": simulation.generation,
+        "population_size": simulation.population_size,
+        "fixed_course": simulation.fixed_course,
+        "selection": simulation.selection,
+        "tournament_size": simulation.tournament_size,
+        "courses": simulation.courses,
+        "fitness": simulation.fitness,
+        "last_gen_avg_score": simulation.last_gen_avg_score,
+        "last_gen_max_score": simulation.last_gen_max_score,
+        "best_score_dino": simulation.best_score_dino,
+        "random_state": simulation.streams.get_state(),
+    }
+    
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        np.savez(file,
+                 metadata=np.array(json.dumps(metadata)),
+                 generation_data=np.array(simulation.generation_data, dtype=float).reshape(-1, 6),
+                 **arrays)
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path, fixed_timestep=False):
+    """
+    Reconstruye una simulación desde un checkpoint.
+    
+    Args:
+        path: ruta del archivo .npz
+        fixed_timestep: modo de reloj de la simulación reanudada
+    
+    Returns:
+        Simulation: simulación al inicio de la generación guardada
+    """
+    with np.load(path, allow_pickle=False) as arrays:
+        metadata = json.loads(str(arrays["metadata"]))
+        if metadata["version"] != CHECKPOINT_VERSION:
+            raise ValueError(f"Versión de checkpoint no soportada: {metadata['version']}")
+        
+        population = population_from_arrays(arrays, "population_")
+        simulation = Simulation(fixed_timestep=fixed_timestep,
+                                population_size=metadata["population_size"],
+                                seed=int(metadata["seed"]),
+                                population=population,
+                                generation=metadata["generation"],
+                                fixed_course=metadata.get("fixed_course", False),
+                                selection=metadata.get("selection", "tournament"),
+                                tournament_size=metadata.get("tournament_size", TOURNAMENT_SIZE),
+                                courses=metadata.get("courses", 1),
+                                fitness=metadata.get("fitness", "mean"))
+        if "best_genes" in arrays:
+            simulation.best_dino_alive = Dino(population_from_arrays(arrays, "best_"))
+        
+        # Columnas [generación, max, promedio, min, varianza, desviación]
+        # (con varios recorridos el max y el min son fitness agregadas, no enteros)
+        score = int if simulation.courses == 1 else float
+        simulation.generation_data = [[int(row[0]), score(row[1]), float(row[2]), score(row[3]),
+                                       float(row[4]), float(row[5])]
+                                      for row in arrays["generation_data"]]
+    
+    simulation.last_gen_avg_score = metadata["last_gen_avg_score"]
+    simulation.last_gen_max_score = metadata["last_gen_max_score"]
+    simulation.best_score_dino = metadata["best_score_dino"]
+    simulation.streams.set_state(metadata["random_state"])
+    return simulation
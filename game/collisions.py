@@ -0,0 +1,77 @@
+"""
+Detección de colisiones de toda la población contra todos los enemigos.
+"""
+import numpy as np
+from game.population import MIN_DINO_X, MAX_DINO_X, DINO_CROUCH_WIDTH
+
+
+# Franja x que puede ocupar un dinosaurio (el más a la derecha, agachado)
+DINO_BAND_LEFT = MIN_DINO_X
+DINO_BAND_RIGHT = MAX_DINO_X + DINO_CROUCH_WIDTH
+
+
+def enemy_boxes(enemies):
+    """
+    Construye las cajas AABB de los enemigos que pueden tocar a algún dinosaurio.
+    Los enemigos que no solapan la franja x de los dinosaurios se descartan.
+    
+    Args:
+        enemies: lista de Enemy
+    
+    Returns:
+        numpy array (m, 4) con [x, y, ancho, alto] de cada enemigo relevante
+    """
+    boxes = [(enemy.x_pos, enemy.y_pos, enemy.obj_width, enemy.obj_height)
+             for enemy in enemies
+             if enemy.x_pos + enemy.obj_width > DINO_BAND_LEFT and enemy.x_pos < DINO_BAND_RIGHT]
+    return np.array(boxes, dtype=np.int64).reshape(-1, 4)
+
+
+def course_boxes(enemies_by_course):
+    """
+    Cajas de los enemigos relevantes de varios recorridos a la vez.
+    
+    Args:
+        enemies_by_course: lista con la lista de Enemy de cada recorrido
+    
+    Returns:
+        tuple: (numpy array (m, 4) con las cajas, numpy array (m,) con el
+               recorrido de cada caja)
+    """
+    boxes = [enemy_boxes(enemies) for enemies in enemies_by_course]
+    courses = np.repeat(np.arange(len(boxes)), [len(course) for course in boxes])
+    return np.concatenate(boxes).reshape(-1, 4), courses
+
+
+def collision_mask(population, indices, boxes, courses=None, boxes_courses=None):
+    """
+    Ejecuta el test AABB de los dinosaurios indicados contra todas las cajas
+    en una sola operación con broadcasting (n x m).
+    
+    Args:
+        population: Population
+        indices: dinosaurios a comprobar
+        boxes: numpy array (m, 4) de enemy_boxes
+        courses: recorrido de cada dinosaurio indicado (opcional); si se da,
+            un dinosaurio solo choca con las cajas de su recorrido
+        boxes_courses: recorrido de cada caja (de course_boxes)
+    
+    Returns:
+        numpy array bool (n,): True para los dinosaurios que colisionan
+    """
+    if len(boxes) == 0 or len(indices) == 0:
+        return np.zeros(len(indices), dtype=bool)
+    
+    x_pos = population.x_pos[indices, None]
+    y_pos = population.y_pos[indices, None]
+    width = population.obj_width[indices, None]
+    height = population.obj_height[indices, None]
+    enemy_x, enemy_y, enemy_width, enemy_height = boxes.T
+    
+    overlaps = ((x_pos + width > enemy_x) &
+                (x_pos < enemy_x + enemy_width) &
+                (y_pos + height > enemy_y) &
+                (y_pos < enemy_y + enemy_height))
+    if courses is not None:
+        overlaps &= courses[:, None] == boxes_courses
+    return overlaps.any(axis=1)
@@ -0,0 +1,147 @@
+"""
+Evaluación de una población en varios recorridos de obstáculos a la vez.
+"""
+import numpy as np
+from game.collisions import course_boxes
+from game.obstacles import ObstacleIndex
+from game.enemy import Cactus, Bird
+from game.simulation import (MIN_SPAWN_MILLIS, MAX_SPAWN_MILLIS, MILLIS_PER_TICK,
+                             TICKS_PER_TENTH)
+
+
+# Formas de resumir los scores de los recorridos (además de un cuantil entre 0 y 1)
+FITNESS_AGGREGATES = ("mean", "min")
+
+
+def check_fitness(fitness):
+    """
+    Comprueba que la agregación de fitness sea válida.
+    
+    Args:
+        fitness: "mean", "min" o un cuantil entre 0 y 1
+    
+    Raises:
+        ValueError: si no es ninguna de ellas
+    """
+    if fitness in FITNESS_AGGREGATES:
+        return
+    if isinstance(fitness, str) or not 0 <= fitness <= 1:
+        raise ValueError(f"Fitness desconocida: {fitness} (mean, min o un cuantil entre 0 y 1)")
+
+
+def aggregate_fitness(scores, fitness="mean"):
+    """
+    Resume los scores de cada dinosaurio en todos los recorridos.
+    
+    Args:
+        scores: numpy array (recorridos, dinosaurios)
+        fitness: "mean", "min" o un cuantil entre 0 y 1
+    
+    Returns:
+        numpy array float (dinosaurios,) con la fitness de cada uno
+    """
+    if fitness == "mean":
+        return scores.mean(axis=0)
+    if fitness == "min":
+        return scores.min(axis=0).astype(float)
+    return np.quantile(scores, fitness, axis=0)
+
+
+class CourseBatch:
+    """
+    Juega la generación actual de una simulación en K recorridos
+    independientes a la vez, con el reloj de paso fijo.
+    La población se replica K veces (Population.tile) compartiendo los
+    cerebros, así en cada frame los sensores, la red neuronal, la física y
+    las colisiones de los K recorridos se calculan en una sola pasada del
+    backend de la simulación. Reloj, velocidad y score son comunes a todos
+    los recorridos; cada uno tiene sus propios enemigos y su propio
+    generador. El recorrido 0 es el de una generación normal, así que con
+    K = 1 los scores son idénticos a Simulation.play_generation.
+    """
+    
+    def __init__(self, simulation, count):
+        """
+        Args:
+            simulation: Simulation al inicio de la generación
+            count: número de recorridos
+        """
+        population = simulation.population
+        course_generation, self.speed = simulation.course_key()
+        self.count = count
+        self.size = population.size
+        self.profiler = simulation.profiler
+        self.backend = simulation.backend
+        self.population = population.tile(count)
+        # Recorrido de cada fila de la población replicada
+        self.row_courses = np.repeat(np.arange(count), population.size)
+        self.score = 0
+        self.ticks = 0
+        
+        self.enemies = [[] for _ in range(count)]
+        self.course_random = [simulation.streams.course(course_generation, index)
+                              for index in range(count)]
+        self.last_spawn_time = [0.0] * count
+        self.time_to_spawn = [rng.uniform(MIN_SPAWN_MILLIS, MAX_SPAWN_MILLIS)
+                              for rng in self.course_random]
+    
+    def play(self):
+        """
+        Juega hasta que mueren todos los dinosaurios de todos los recorridos.
+        
+        Returns:
+            numpy array (recorridos, dinosaurios) con los scores
+        """
+        while len(self.population.alive_indices()) > 0:
+            self.update_frame()
+            if len(self.population.alive_indices()) > 0:
+                self.advance_clock()
+        return self.population.score.reshape(self.count, self.size).copy()
+    
+    def advance_clock(self):
+        """Avanza el reloj un tick (el score sube cada décima de segundo)."""
+        self.ticks += 1
+        if self.ticks % TICKS_PER_TENTH == 0:
+            self.population.toggle_sprites()
+            self.score += 1
+    
+    def update_frame(self):
+        """Actualiza los dinosaurios y los enemigos de todos los recorridos durante un frame."""
+        profiler = self.profiler
+        frame_start = start = profiler.clock()
+        population = self.population
+        speed = int(self.speed)
+        
+        # Sensores, red neuronal y física de todos los recorridos en una sola
+        # pasada del backend de la simulación
+        alive = population.alive_indices()
+        alive_courses = self.row_courses[alive]
+        enemies = [enemy for course in self.enemies for enemy in course]
+        enemies_courses = np.repeat(np.arange(self.count), [len(course) for course in self.enemies])
+        obstacles = ObstacleIndex(enemies, enemies_courses)
+        start = profiler.lap("obstacle_index", start)
+        self.backend.update(population, alive, obstacles, speed, alive_courses)
+        start = profiler.lap("dinos", start)
+        
+        # Enemigos y spawn de cada recorrido
+        current_time = self.ticks * MILLIS_PER_TICK
+        for course, enemies in enumerate(self.enemies):
+            for enemy in enemies:
+                enemy.update(speed)
+            enemies[:] = [enemy for enemy in enemies if not enemy.is_offscreen()]
+            
+            if current_time - self.last_spawn_time[course] > self.time_to_spawn[course]:
+                rng = self.course_random[course]
+                enemies.append(Cactus(rng) if rng.random() < 0.5 else Bird(rng))
+                self.last_spawn_time[course] = current_time
+                self.time_to_spawn[course] = rng.uniform(MIN_SPAWN_MILLIS, MAX_SPAWN_MILLIS)
+        start = profiler.lap("enemies", start)
+        
+        # Colisiones de todos los recorridos en una sola pasada
+        boxes, boxes_courses = course_boxes(self.enemies)
+        colliding = self.backend.collisions(population, alive, boxes, alive_courses, boxes_courses)
+        population.die(alive[colliding], self.score)
+        profiler.lap("collisions", start)
+        
+        self.speed += 0.001
+        profiler.lap("frame", frame_start)
@@ -1,39 +1,98 @@
-import random
+import numpy as np
 from game.game_object import GameObject
-from neural_network.genome import Genome
-from neural_network.brain import Brain
+from game.population import Population, DINO_CROUCH_WIDTH, JUMP_STAGES
+
+
+def _population_field(name, doc):
+    """Crea una propiedad que lee y escribe una columna de la población."""
+    def getter(self):
+        return getattr(self.population, name)[self.index].item()
+    
+    def setter(self, value):
+        getattr(self.population, name)[self.index] = value
+    
+    return property(getter, setter, doc=doc)
 
 
 class Dino(GameObject):
     """
     Dinosaurio con red neuronal y genoma.
     Puede saltar, agacharse y morir al colisionar con enemigos.
+    
+    Es una vista ligera sobre una fila de Population: el estado vive en los
+    arrays de la población y se usa para dibujar e inspeccionar.
     """
     
-    def __init__(self):
-        super().__init__()
-        self.x_pos = random.randint(100, 300)
-        self.y_pos = 450
-        self.obj_width = 80
-        self.obj_height = 86
-        
-        self.jump_stage = 0
-        self.alive = True
-        self.score = 0
-        
-        # Red neuronal
-        self.genome = Genome()
-        self.brain = None
-        self.init_brain()
-        self.brain_inputs = [0] * 7
+    x_pos = _population_field("x_pos", "Posición x")
+    y_pos = _population_field("y_pos", "Posición y")
+    obj_width = _population_field("obj_width", "Ancho de la caja de colisión")
+    obj_height = _population_field("obj_height", "Alto de la caja de colisión")
+    jump_frame = _population_field("jump_frame", "Frame del salto (0 = en el suelo)")
+    score = _population_field("score", "Score con el que murió")
+    
+    def __init__(self, population=None, index=0):
+        """
+        Args:
+            population: población a la que pertenece (por defecto, una nueva de tamaño 1)
+            index: fila del dinosaurio dentro de la población
+        """
+        # No se llama a GameObject.__init__: el estado ya vive en la población
+        if population is None:
+            population = Population(1)
+        self.population = population
+        self.index = index
+        self._rows = np.array([index])
         
         # Sprite
-        self.sprite = "walking_dino_1"
         self.sprite_offset = [-4, -2]
     
+    @property
+    def alive(self):
+        """Si sigue vivo."""
+        return self.population.alive[self.index].item()
+    
+    @alive.setter
+    def alive(self, value):
+        self.population.set_alive(self._rows, value)
+    
+    @property
+    def jump_stage(self):
+        """Progreso del salto entre 0 y 1 (0 = en el suelo)."""
+        frame = self.jump_frame
+        return JUMP_STAGES[frame - 1].item() if frame else 0
+    
+    @property
+    def genome(self):
+        """Genoma del dinosaurio."""
+        return self.population.genomes[self.index]
+    
+    @genome.setter
+    def genome(self, genome):
+        self.population.genomes[self.index] = genome
+    
+    @property
+    def brain(self):
+        """Cerebro (red neuronal) del dinosaurio."""
+        return self.population.brain.brain(self.index, self.brain_inputs)
+    
+    @property
+    def brain_inputs(self):
+        """Entradas normalizadas de la red neuronal."""
+        return self.population.brain_inputs[self.index]
+    
+    @property
+    def sprite(self):
+        """Nombre del sprite actual, derivado del estado del dinosaurio."""
+        if self.jumping():
+            return "standing_dino"
+        frame = self.population.sprite_frame[self.index] + 1
+        if self.crouching():
+            return f"crouching_dino_{frame}"
+        return f"walking_dino_{frame}"
+    
     def init_brain(self):
         """Inicializa el cerebro (red neuronal) desde el genoma."""
-        self.brain = Brain(self.genome)
+        self.population.brain.load_genome(self.index, self.genome)
     
     def update(self, next_obstacle_info, speed):
         """
@@ -46,12 +105,7 @@ class Dino(GameObject):
         if not self.alive:
             return
         
-        self.update_brain_inputs(next_obstacle_info, speed)
-        self.brain.feed_forward(self.brain_inputs)
-        self.process_brain_output()
-        
-        if self.jumping():
-            self.update_jump()
+        self.population.update(np.array([next_obstacle_info]), speed, self._rows)
     
     def update_brain_inputs(self, next_obstacle_info, speed):
         """
@@ -61,21 +115,11 @@ class Dino(GameObject):
             next_obstacle_info: [distancia, x, y, ancho, alto] del obstáculo
             speed: velocidad del juego
         """
-        self.brain_inputs[0] = next_obstacle_info[0] / 900  # distancia normalizada
-        self.brain_inputs[1] = (next_obstacle_info[1] - 450) / (1350 - 450)  # x normalizada
-        self.brain_inputs[2] = (next_obstacle_info[2] - 370) / (480 - 370)   # y normalizada
-        self.brain_inputs[3] = (next_obstacle_info[3] - 30) / (146 - 30)     # ancho normalizado
-        self.brain_inputs[4] = (next_obstacle_info[4] - 40) / (96 - 40)      # alto normalizado
-        self.brain_inputs[5] = (self.y_pos - 278) / (484 - 278)              # y del dino normalizada
-        self.brain_inputs[6] = (speed - 15) / (30 - 15)                      # velocidad normalizada
+        self.population.update_brain_inputs(self._rows, np.array([next_obstacle_info]), speed)
     
     def update_jump(self):
         """Actualiza la física del salto (parábola)."""
-        self.y_pos = int(450 - ((-4 * self.jump_stage * (self.jump_stage - 1)) * 172))
-        self.jump_stage += 0.03
-        
-        if self.jump_stage > 1:
-            self.stop_jump()
+        self.population.update_jump(self._rows)
     
     def process_brain_output(self):
         """
@@ -83,53 +127,31 @@ class Dino(GameObject):
         outputs[0] = saltar
         outputs[1] = agacharse
         """
-        # Saltar
-        if self.brain.outputs[0] != 0:
-            if not self.crouching() and not self.jumping():
-                self.jump()
-        
-        # Agacharse
-        if self.brain.outputs[1] == 0:
-            if self.crouching():
-                self.stop_crouch()
-        else:
-            if self.jumping():
-                self.stop_jump()
-            self.crouch()
+        self.population.process_brain_output(self._rows, self.population.brain.outputs[self._rows])
     
     def jump(self):
         """Inicia el salto."""
-        self.jump_stage = 0.0001
-        self.sprite = "standing_dino"
+        self.population.jump(self._rows)
     
     def stop_jump(self):
         """Detiene el salto y vuelve al suelo."""
-        self.jump_stage = 0
-        self.y_pos = 450
-        self.sprite = "walking_dino_1"
+        self.population.stop_jump(self._rows)
     
     def crouch(self):
         """Agacha al dinosaurio."""
-        if not self.crouching():
-            self.y_pos = 484
-            self.obj_width = 110
-            self.obj_height = 52
-            self.sprite = "crouching_dino_1"
+        self.population.crouch(self._rows)
     
     def stop_crouch(self):
         """Deja de agacharse."""
-        self.y_pos = 450
-        self.obj_width = 80
-        self.obj_height = 86
-        self.sprite = "walking_dino_1"
+        self.population.stop_crouch(self._rows)
     
     def jumping(self):
         """Verifica si está saltando."""
-        return self.jump_stage > 0
+        return self.jump_frame > 0
     
     def crouching(self):
         """Verifica si está agachado."""
-        return self.obj_width == 110
+        return self.obj_width == DINO_CROUCH_WIDTH
     
     def die(self, sim_score):
         """
@@ -138,25 +160,16 @@ class Dino(GameObject):
         Args:
             sim_score: score de la simulación cuando murió
         """
-        self.alive = False
-        self.score = sim_score
+        self.population.die(self._rows, sim_score)
     
     def reset(self):
         """Resetea el dinosaurio para la siguiente generación."""
-        self.alive = True
-        self.score = 0
+        self.population.reset(self._rows)
     
     def toggle_sprite(self):
         """Alterna entre sprites de animación."""
-        if self.sprite == "walking_dino_1":
-            self.sprite = "walking_dino_2"
-        elif self.sprite == "walking_dino_2":
-            self.sprite = "walking_dino_1"
-        elif self.sprite == "crouching_dino_1":
-            self.sprite = "crouching_dino_2"
-        elif self.sprite == "crouching_dino_2":
-            self.sprite = "crouching_dino_1"
+        self.population.sprite_frame[self.index] ^= 1
     
     def __lt__(self, other):
         """Comparación para ordenamiento por score."""
-        return self.score < other.score
\ No newline at end of file
+        return self.score < other.score
@@ -1,7 +1,7 @@
 """
 Clases de enemigos: Cactus y Bird (Pájaro).
 """
-import random
+import numpy as np
 from game.game_object import GameObject
 
 
@@ -39,9 +39,15 @@ class Cactus(Enemy):
     CACTUS_HEIGHTS = [66, 66, 66, 96, 96, 96]
     CACTUS_Y_POS = [470, 470, 470, 444, 444, 444]
     
-    def __init__(self):
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng: numpy.random.Generator para elegir el tipo (por defecto, uno nuevo sin semilla)
+        """
         super().__init__()
-        self.type = random.randint(0, 5)
+        if rng is None:
+            rng = np.random.default_rng()
+        self.type = int(rng.integers(0, 6))
         self.obj_width = self.CACTUS_WIDTHS[self.type]
         self.obj_height = self.CACTUS_HEIGHTS[self.type]
         self.y_pos = self.CACTUS_Y_POS[self.type]
@@ -55,12 +61,18 @@ class Bird(Enemy):
     # Alturas posibles para el pájaro
     BIRD_Y_POS = [435, 480, 370]
     
-    def __init__(self):
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng: numpy.random.Generator para elegir la altura (por defecto, uno nuevo sin semilla)
+        """
         super().__init__()
+        if rng is None:
+            rng = np.random.default_rng()
         self.x_pos = 1350
         self.obj_width = 84
         self.obj_height = 40
-        self.type = random.randint(0, 2)
+        self.type = int(rng.integers(0, 3))
         self.y_pos = self.BIRD_Y_POS[self.type]
         self.sprite = "bird_flying_1"
         self.sprite_offset = [-4, -16]
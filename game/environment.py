@@ -0,0 +1,153 @@
+"""
+Entorno por lotes al estilo gym sobre el núcleo de la simulación.
+
+Permite controlar a los dinosaurios con cualquier optimizador (CMA-ES,
+estrategias evolutivas, políticas propias) sin el algoritmo genético:
+cada paso recibe la acción de cada dinosaurio y devuelve las observaciones
+normalizadas (las mismas entradas que usa la red neuronal), las
+recompensas y los dinosaurios que ya terminaron.
+
+Uso:
+    env = DinoEnv(500, seed=0)
+    observations = env.reset()
+    while not env.all_done():
+        actions = policy(observations)
+        observations, rewards, dones, info = env.step(actions)
+"""
+import numpy as np
+from game.simulation import Simulation
+
+
+# Acciones discretas
+ACTION_NONE = 0
+ACTION_JUMP = 1
+ACTION_CROUCH = 2
+
+# Tamaño de cada observación (entradas de la red neuronal)
+OBSERVATION_SIZE = 7
+
+
+def actions_to_outputs(actions):
+    """
+    Convierte acciones discretas en salidas de red [saltar, agacharse].
+    
+    Args:
+        actions: array (n,) con ACTION_NONE, ACTION_JUMP o ACTION_CROUCH,
+                 o array (n, 2) con salidas de red (distinto de 0 = sí)
+    
+    Returns:
+        numpy array (n, 2)
+    """
+    actions = np.asarray(actions)
+    if actions.ndim == 2:
+        return actions
+    outputs = np.zeros((len(actions), 2))
+    outputs[:, 0] = actions == ACTION_JUMP
+    outputs[:, 1] = actions == ACTION_CROUCH
+    return outputs
+
+
+class DinoEnv:
+    """
+    N dinosaurios jugando a la vez el mismo recorrido, sin pantalla y con
+    el reloj de paso fijo. Un episodio termina cuando han muerto todos.
+    
+    El episodio k (contando desde el último reset con semilla) juega el
+    mismo recorrido que la generación k de una Simulation con esa semilla,
+    así que controlar el entorno con los cerebros de la población da
+    exactamente los mismos scores que el algoritmo genético.
+    
+    La recompensa de un paso es lo que sube el score en ese paso, solo para
+    los dinosaurios que siguen vivos al terminarlo: la suma de recompensas
+    de un episodio es el score con el que murió cada uno.
+    """
+    
+    def __init__(self, num_envs, seed=None):
+        """
+        Args:
+            num_envs: número de dinosaurios por episodio
+            seed: semilla de los recorridos y de las posiciones x
+        """
+        self.num_envs = num_envs
+        self.seed = seed
+        self.simulation = None
+    
+    @property
+    def population(self):
+        """Population del episodio actual (posición, salto y score de cada dinosaurio)."""
+        return self.simulation.population
+    
+    def reset(self, seed=None):
+        """
+        Empieza un episodio nuevo: todos vivos, de pie y con score 0.
+        Con una semilla (o en el primer reset) se vuelve al primer recorrido
+        de esa semilla; sin ella se juega el recorrido siguiente.
+        
+        Args:
+            seed: semilla opcional
+        
+        Returns:
+            numpy array (N, 7) con las observaciones iniciales
+        """
+        if seed is not None:
+            self.seed = seed
+        if seed is not None or self.simulation is None:
+            self.simulation = Simulation(fixed_timestep=True, population_size=self.num_envs,
+                                         seed=self.seed)
+            self.seed = self.simulation.seed
+        else:
+            self.simulation.generation += 1
+            self.simulation.population.reset()
+            self.simulation.dinos_alive = self.num_envs
+            self.simulation.start_generation()
+        return self.observe()
+    
+    def step(self, actions):
+        """
+        Avanza un frame con las acciones dadas (las de los muertos se ignoran).
+        
+        Args:
+            actions: array (N,) de acciones discretas o (N, 2) de salidas de red
+        
+        Returns:
+            tuple: (observaciones (N, 7), recompensas (N,), terminados (N,) bool, info)
+        """
+        simulation = self.simulation
+        population = simulation.population
+        if simulation.dinos_alive == 0:
+            raise RuntimeError("El episodio terminó: llama a reset() antes de step()")
+        
+        outputs = actions_to_outputs(actions)
+        alive = population.alive_indices()
+        population.act(alive, outputs[alive])
+        simulation.update_world()
+        
+        score = simulation.score
+        if simulation.dinos_alive > 0:
+            simulation.advance_clock()
+        
+        rewards = np.zeros(self.num_envs)
+        rewards[population.alive_indices()] = simulation.score - score
+        info = {"score": simulation.score, "alive": simulation.dinos_alive,
+                "ticks": simulation.generation_ticks}
+        return self.observe(), rewards, ~population.alive, info
+    
+    def observe(self):
+        """
+        Lee los sensores de los vivos con la misma normalización que la red
+        neuronal. Los muertos conservan su última observación.
+        
+        Returns:
+            numpy array (N, 7) con las observaciones
+        """
+        population = self.simulation.population
+        self.simulation.sense(population.alive_indices())
+        return population.brain_inputs.copy()
+    
+    def all_done(self):
+        """True si ya murieron todos los dinosaurios del episodio."""
+        return self.simulation.dinos_alive == 0
+    
+    def scores(self):
+        """Score de cada dinosaurio en el episodio (final para los muertos)."""
+        return self.simulation.population.score.copy()
@@ -0,0 +1,210 @@
+"""
+Evaluación de generaciones repartida entre varios procesos.
+"""
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+
+# Scores memorizados como máximo
+DEFAULT_MEMO_CAPACITY = 100000
+
+
+def evaluate_population(population, seed, generation, fixed_course=False, courses=1, fitness="mean",
+                        backend="auto"):
+    """
+    Juega una generación completa con el recorrido de la semilla dada.
+    Se ejecuta dentro de los procesos del pool.
+    
+    Args:
+        population: Population a evaluar (un fragmento de la generación)
+        seed: semilla del recorrido de obstáculos
+        generation: número de la generación (decide el recorrido y la velocidad)
+        fixed_course: si todas las generaciones juegan el mismo recorrido
+        courses: recorridos jugados a la vez
+        fitness: agregación de los scores de varios recorridos
+        backend: backend del paso de la población
+    
+    Returns:
+        numpy array con el score de cada dinosaurio
+    """
+    from game.simulation import Simulation
+    simulation = Simulation(fixed_timestep=True, seed=seed, population=population,
+                            generation=generation, fixed_course=fixed_course,
+                            courses=courses, fitness=fitness, backend=backend)
+    return simulation.play_generation()
+
+
+def evaluate_locally(simulation, population):
+    """
+    Juega la generación actual de la simulación con otra población, en este proceso.
+    
+    Args:
+        simulation: Simulation con paso fijo y semilla
+        population: Population a evaluar
+    
+    Returns:
+        numpy array con el score de cada dinosaurio
+    """
+    return evaluate_population(population, simulation.seed, simulation.generation,
+                               simulation.fixed_course, simulation.courses, simulation.fitness,
+                               simulation.backend.name)
+
+
+def genome_bytes(genomes):
+    """
+    Clave de cada genoma: los bytes de sus genes y sus bias (dos genomas
+    con los mismos genes pero distintos bias juegan distinto).
+    
+    Args:
+        genomes: GenomeBatch
+    
+    Returns:
+        list con un valor hashable por genoma
+    """
+    size = len(genomes)
+    rows = np.concatenate([np.ascontiguousarray(array).view(np.uint8).reshape(size, -1)
+                           for array in (genomes.genes, genomes.hidden_layer_bias,
+                                         genomes.output_layer_bias)], axis=1)
+    return rows.view(np.dtype((np.void, rows.shape[1]))).ravel().tolist()
+
+
+class ParallelEvaluator:
+    """
+    Reparte la población de cada generación entre un ProcessPoolExecutor.
+    Todos los procesos juegan el mismo recorrido (misma semilla y generación),
+    así que los scores son idénticos a los de una ejecución en un solo proceso.
+    """
+    
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers: número de procesos (por defecto, uno por núcleo)
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+    
+    def evaluate(self, simulation, population=None):
+        """
+        Juega la generación actual de la simulación en paralelo.
+        
+        Args:
+            simulation: Simulation con paso fijo y semilla
+            population: Population a evaluar (por defecto, la de la simulación)
+        
+        Returns:
+            numpy array con el score de cada dinosaurio, en el orden de la población
+        """
+        if not simulation.fixed_timestep:
+            raise ValueError("La evaluación en paralelo necesita una simulación con paso fijo")
+        
+        if population is None:
+            population = simulation.population
+        shards = [shard for shard in np.array_split(np.arange(population.size), self.workers) if len(shard)]
+        futures = [self.executor.submit(evaluate_population, population.select(shard),
+                                        simulation.seed, simulation.generation, simulation.fixed_course,
+                                        simulation.courses, simulation.fitness, simulation.backend.name)
+                   for shard in shards]
+        return np.concatenate([future.result() for future in futures])
+    
+    def close(self):
+        """Detiene los procesos del pool."""
+        self.executor.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class MemoizedEvaluator:
+    """
+    Evalúa cada dinosaurio distinto una sola vez.
+    Con paso fijo, el score de un dinosaurio solo depende de su genoma
+    (genes y bias), su posición x y los recorridos (semilla,
+    Simulation.course_key, número de recorridos y agregación de la
+    fitness), así que los duplicados dentro de una generación (élites, el
+    mejor reinsertado, hijos repetidos) y entre generaciones con el mismo
+    recorrido reutilizan el score ya calculado. Los scores resultantes son
+    idénticos a los de jugar la población completa.
+    """
+    
+    def __init__(self, evaluator=None, capacity=DEFAULT_MEMO_CAPACITY):
+        """
+        Args:
+            evaluator: evaluador de los dinosaurios nuevos (p. ej.
+                ParallelEvaluator); por defecto se juegan en este proceso
+            capacity: número máximo de scores memorizados (expulsión LRU)
+        """
+        self.evaluator = evaluator
+        self.capacity = capacity
+        self.scores = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def reset_stats(self):
+        """Pone a cero los contadores de aciertos y fallos."""
+        self.hits = 0
+        self.misses = 0
+    
+    def evaluate(self, simulation):
+        """
+        Calcula el score de cada dinosaurio de la generación actual,
+        jugando solo los que no se han visto antes en este recorrido.
+        
+        Args:
+            simulation: Simulation con paso fijo y semilla
+        
+        Returns:
+            numpy array con el score de cada dinosaurio, en el orden de la población
+        """
+        if not simulation.fixed_timestep:
+            raise ValueError("La memorización de scores necesita una simulación con paso fijo")
+        
+        population = simulation.population
+        course = (simulation.seed, *simulation.course_key(), simulation.courses, simulation.fitness)
+        genome_keys = genome_bytes(population.genomes)
+        
+        scores = np.empty(population.size, dtype=np.int64 if simulation.courses == 1 else float)
+        pending = {}
+        for row, (genome_key, x_pos) in enumerate(zip(genome_keys, population.x_pos.tolist())):
+            key = (course, genome_key, x_pos)
+            score = self.scores.get(key)
+            if score is not None:
+                self.scores.move_to_end(key)
+                scores[row] = score
+                self.hits += 1
+            elif key in pending:
+                # Duplicado dentro de la generación: se juega una vez
+                pending[key].append(row)
+                self.hits += 1
+            else:
+                pending[key] = [row]
+                self.misses += 1
+        
+        if pending:
+            distinct = population.select([rows[0] for rows in pending.values()])
+            if self.evaluator is None:
+                distinct_scores = evaluate_locally(simulation, distinct)
+            else:
+                distinct_scores = self.evaluator.evaluate(simulation, distinct)
+            for (key, rows), score in zip(pending.items(), distinct_scores.tolist()):
+                scores[rows] = score
+                self.scores[key] = score
+        
+        while len(self.scores) > self.capacity:
+            self.scores.popitem(last=False)
+        return scores
+    
+    def close(self):
+        """Detiene el evaluador interno, si lo hay."""
+        if self.evaluator is not None:
+            self.evaluator.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
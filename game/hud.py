@@ -0,0 +1,89 @@
+"""
+Capa de HUD con superficies cacheadas: textos y diagrama de la red neuronal.
+"""
+from collections import OrderedDict
+import pygame
+
+
+# Textos renderizados guardados como máximo
+TEXT_CACHE_CAPACITY = 512
+
+# Zona de la pantalla que ocupa el diagrama de la red (etiquetas incluidas)
+NETWORK_AREA = pygame.Rect(540, 40, 440, 300)
+
+
+class TextCache:
+    """
+    Guarda las superficies de texto ya renderizadas hasta que cambia su
+    contenido, con expulsión LRU. Un texto que no cambia entre frames
+    (generación, promedio, valores repetidos) se renderiza una sola vez.
+    """
+    
+    def __init__(self, capacity=TEXT_CACHE_CAPACITY):
+        """
+        Args:
+            capacity: número máximo de superficies guardadas
+        """
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+    
+    def render(self, font, text, color=(0, 0, 0)):
+        """
+        Devuelve la superficie del texto, renderizándola solo si no está guardada.
+        
+        Args:
+            font: pygame.font.Font
+            text: texto a renderizar
+            color: color del texto
+        
+        Returns:
+            pygame.Surface
+        """
+        key = (id(font), text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.surfaces[key] = surface
+            if len(self.surfaces) > self.capacity:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+
+class Hud:
+    """
+    Renderizador del HUD de la simulación.
+    El diagrama estático de la red (etiquetas, conexiones y capa de entrada)
+    se dibuja una vez por cerebro en una superficie propia; en cada frame
+    solo se copia esa superficie y se dibujan encima las activaciones.
+    """
+    
+    def __init__(self):
+        self.text_cache = TextCache()
+        self.diagram = None
+        self.diagram_key = None
+    
+    def draw_text(self, screen, font, text, position, color=(0, 0, 0)):
+        """Dibuja un texto usando el caché de superficies."""
+        screen.blit(self.text_cache.render(font, text, color), position)
+    
+    def draw_network(self, screen, brain, font):
+        """
+        Dibuja la red neuronal de un cerebro.
+        
+        Args:
+            screen: superficie de pygame
+            brain: Brain a dibujar
+            font: fuente para el texto
+        """
+        key = (brain.hidden_layer_weights.tobytes(), brain.output_layer_weights.tobytes())
+        if key != self.diagram_key:
+            if self.diagram is None or self.diagram.get_size() != screen.get_size():
+                self.diagram = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+            self.diagram.fill((0, 0, 0, 0))
+            brain.draw_static(self.diagram, font)
+            self.diagram_key = key
+        
+        screen.blit(self.diagram, NETWORK_AREA.topleft, area=NETWORK_AREA)
+        brain.draw_activations(screen, font, self.text_cache)
@@ -0,0 +1,78 @@
+"""
+Índice de obstáculos ordenado por x para calcular los sensores de toda la población.
+"""
+import numpy as np
+
+
+# Sensor cuando no hay ningún obstáculo por delante: [distancia, x, y, ancho, alto]
+NO_OBSTACLE_DISTANCE = 1280
+
+# Separación entre recorridos en la clave de búsqueda (mucho mayor que la pantalla)
+COURSE_KEY_SPAN = 1 << 32
+
+
+class ObstacleIndex:
+    """
+    Índice de los enemigos en pantalla, ordenado por x.
+    Se construye una vez por frame y responde el siguiente obstáculo de
+    todos los dinosaurios a la vez con búsqueda binaria (searchsorted).
+    Con varios recorridos a la vez, los enemigos se ordenan por
+    (recorrido, x) y cada dinosaurio solo ve los de su recorrido.
+    """
+    
+    def __init__(self, enemies, courses=None):
+        """
+        Args:
+            enemies: lista de Enemy en pantalla
+            courses: recorrido de cada enemigo (opcional, por defecto uno solo)
+        """
+        boxes = np.array([(enemy.x_pos, enemy.y_pos, enemy.obj_width, enemy.obj_height)
+                          for enemy in enemies], dtype=np.int64).reshape(-1, 4)
+        if courses is None:
+            order = np.argsort(boxes[:, 0], kind="stable")
+            self.x_pos = boxes[order, 0]
+            self.courses = None
+        else:
+            courses = np.asarray(courses, dtype=np.int64)
+            order = np.lexsort((boxes[:, 0], courses))
+            self.x_pos = courses[order] * COURSE_KEY_SPAN + boxes[order, 0]
+            # Recorrido de cada fila, con -1 en la fila extra de "sin obstáculo"
+            self.courses = np.append(courses[order], -1)
+        
+        # Tabla [x, y, ancho, alto] con una fila extra (ceros) para "sin obstáculo"
+        self.table = np.zeros((len(boxes) + 1, 4), dtype=np.int64)
+        self.table[:-1] = boxes[order]
+    
+    def __len__(self):
+        return len(self.x_pos)
+    
+    def next_obstacles_info(self, dinos_x_pos, out=None, dinos_courses=None):
+        """
+        Encuentra el siguiente obstáculo (el primero con x mayor) de cada dinosaurio.
+        
+        Args:
+            dinos_x_pos: numpy array (n,) con la posición x de cada dinosaurio
+            out: numpy array (n, 5) opcional donde escribir el resultado
+            dinos_courses: numpy array (n,) con el recorrido de cada dinosaurio
+                (obligatorio si el índice se creó con courses)
+        
+        Returns:
+            numpy array (n, 5) con [distancia, x, y, ancho, alto] por dinosaurio
+        """
+        if out is None:
+            out = np.empty((len(dinos_x_pos), 5), dtype=np.int64)
+        
+        if self.courses is None:
+            following = np.searchsorted(self.x_pos, dinos_x_pos, side="right")
+            found = following < len(self.x_pos)
+        else:
+            keys = dinos_courses * COURSE_KEY_SPAN + dinos_x_pos
+            following = np.searchsorted(self.x_pos, keys, side="right")
+            found = self.courses[following] == dinos_courses
+            # El siguiente de otro recorrido cuenta como "sin obstáculo"
+            following[~found] = len(self.x_pos)
+        np.take(self.table, following, axis=0, out=out[:, 1:])
+        
+        np.subtract(out[:, 1], dinos_x_pos, out=out[:, 0])
+        out[~found, 0] = NO_OBSTACLE_DISTANCE
+        return out
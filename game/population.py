@@ -0,0 +1,456 @@
+"""
+Población de dinosaurios almacenada como estructura de arrays (SoA).
+"""
+import numpy as np
+from neural_network.genome import GenomeBatch
+from neural_network.brain import PopulationBrain
+
+
+# Geometría del dinosaurio
+DINO_GROUND_Y = 450
+DINO_CROUCH_Y = 484
+DINO_WIDTH = 80
+DINO_HEIGHT = 86
+DINO_CROUCH_WIDTH = 110
+DINO_CROUCH_HEIGHT = 52
+MIN_DINO_X = 100
+MAX_DINO_X = 300
+
+# Física del salto
+JUMP_START_STAGE = 0.0001
+JUMP_STAGE_STEP = 0.03
+JUMP_HEIGHT = 172
+
+
+def jump_trajectory():
+    """
+    Precalcula el salto frame a frame con las mismas operaciones en coma
+    flotante que la parábola original (etapa += 0.03 hasta pasar de 1).
+    
+    Returns:
+        tuple: (etapa de cada frame, y de cada frame)
+    """
+    stages = []
+    stage = JUMP_START_STAGE
+    while stage <= 1:
+        stages.append(stage)
+        stage = stage + JUMP_STAGE_STEP
+    stages = np.array(stages)
+    y_pos = (DINO_GROUND_Y - ((-4 * stages * (stages - 1)) * JUMP_HEIGHT)).astype(np.int64)
+    return stages, y_pos
+
+
+# Tabla del salto compartida por todos los dinosaurios: el frame f (1..JUMP_FRAMES)
+# del salto usa JUMP_Y_POS[f - 1]; frame 0 = en el suelo
+JUMP_STAGES, JUMP_Y_POS = jump_trajectory()
+JUMP_FRAMES = len(JUMP_Y_POS)
+
+# En una población replicada, fracción de vivos a partir de la cual la red se
+# evalúa para todas las copias en bloque (sin copiar pesos) en vez de por filas
+DENSE_BRAIN_FRACTION = 0.5
+
+
+class Population:
+    """
+    Estado de toda la población de dinosaurios en arrays contiguos de NumPy.
+    Cada fila es un dinosaurio; saltar, agacharse, morir y puntuar se
+    ejecutan como operaciones sobre arrays completos.
+    """
+    
+    # Columnas de estado que se copian al seleccionar o concatenar
+    STATE_FIELDS = ("x_pos", "y_pos", "obj_width", "obj_height", "jump_frame",
+                    "alive", "score", "sprite_frame", "brain_inputs")
+    
+    def __init__(self, size, genomes=None, placement_rng=None, genome_rng=None, brain_cache=None):
+        """
+        Args:
+            size: número de dinosaurios
+            genomes: GenomeBatch opcional (por defecto, genomas aleatorios)
+            placement_rng: numpy.random.Generator para la posición x
+            genome_rng: numpy.random.Generator para los genomas aleatorios
+            brain_cache: BrainCache opcional para construir los cerebros
+        """
+        if placement_rng is None:
+            placement_rng = np.random.default_rng()
+        if genome_rng is None:
+            genome_rng = np.random.default_rng()
+        
+        self.size = size
+        self.x_pos = placement_rng.integers(MIN_DINO_X, MAX_DINO_X + 1, size)
+        self.y_pos = np.full(size, DINO_GROUND_Y)
+        self.obj_width = np.full(size, DINO_WIDTH)
+        self.obj_height = np.full(size, DINO_HEIGHT)
+        
+        self.jump_frame = np.zeros(size, dtype=np.int32)
+        self.alive = np.ones(size, dtype=bool)
+        # Índices de los vivos (ordenados), mantenidos al morir y al resetear
+        self.living = np.arange(size)
+        self.score = np.zeros(size, dtype=np.int64)
+        
+        # Fotograma de animación (0 o 1) para caminar y agacharse
+        self.sprite_frame = np.zeros(size, dtype=np.int8)
+        
+        # Red neuronal
+        if genomes is None:
+            genomes = GenomeBatch.random(size, genome_rng)
+        self.genomes = genomes
+        self.brain = PopulationBrain.from_genomes(self.genomes, brain_cache)
+        # Fila del cerebro de cada dinosaurio (None = la misma fila)
+        self.brain_rows = None
+        self.brain_inputs = np.zeros((size, 7))
+        self.clear_score_stats()
+    
+    def __len__(self):
+        return self.size
+    
+    def select(self, indices):
+        """
+        Crea una nueva población copiando las filas indicadas.
+        
+        Args:
+            indices: índices de los dinosaurios a copiar
+        
+        Returns:
+            Population: población con el estado, genomas y cerebros copiados
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        selected = Population.__new__(Population)
+        selected.size = len(indices)
+        for field in self.STATE_FIELDS:
+            setattr(selected, field, getattr(self, field)[indices])
+        selected.genomes = self.genomes.select(indices)
+        selected.brain = self.brain.select(indices)
+        selected.brain_rows = None
+        selected.living = np.flatnonzero(selected.alive)
+        selected.clear_score_stats()
+        return selected
+    
+    @classmethod
+    def concatenate(cls, populations):
+        """
+        Une varias poblaciones en una sola, en el orden dado.
+        
+        Args:
+            populations: lista de Population
+        
+        Returns:
+            Population: población resultante
+        """
+        joined = cls.__new__(cls)
+        joined.size = sum(population.size for population in populations)
+        for field in cls.STATE_FIELDS:
+            setattr(joined, field, np.concatenate([getattr(p, field) for p in populations]))
+        joined.genomes = GenomeBatch.concatenate([p.genomes for p in populations])
+        joined.brain = PopulationBrain.concatenate([p.brain for p in populations])
+        joined.brain_rows = None
+        joined.living = np.flatnonzero(joined.alive)
+        joined.clear_score_stats()
+        return joined
+    
+    def tile(self, copies):
+        """
+        Replica la población para jugar varios recorridos a la vez: la fila
+        copia * size + i es el dinosaurio i en el recorrido copia. Cada copia
+        tiene su propio estado (posición, salto, vida, score), pero todas
+        usan los genomas y cerebros de esta población, sin duplicar pesos.
+        La población replicada solo sirve para jugar (no para seleccionar).
+        
+        Args:
+            copies: número de copias
+        
+        Returns:
+            Population: población de copies * size filas
+        """
+        rows = np.tile(np.arange(self.size), copies)
+        tiled = Population.__new__(Population)
+        tiled.size = len(rows)
+        for field in self.STATE_FIELDS:
+            setattr(tiled, field, getattr(self, field)[rows])
+        tiled.genomes = self.genomes
+        tiled.brain = self.brain
+        tiled.brain_rows = rows
+        tiled.living = np.flatnonzero(tiled.alive)
+        tiled.clear_score_stats()
+        return tiled
+    
+    def dinos(self):
+        """
+        Devuelve vistas Dino sobre cada fila (para dibujar e inspeccionar).
+        
+        Returns:
+            list: lista de Dino
+        """
+        from game.dino import Dino
+        return [Dino(self, i) for i in range(self.size)]
+    
+    def alive_indices(self):
+        """
+        Índices de los dinosaurios vivos, en orden. No recorre la población:
+        el array se compacta a medida que mueren, así que su coste depende
+        solo de los supervivientes. No se debe modificar.
+        """
+        return self.living
+    
+    def set_alive(self, indices, value):
+        """
+        Marca dinosaurios como vivos o muertos sin tocar su score.
+        
+        Args:
+            indices: dinosaurios a marcar
+            value: True para vivos, False para muertos
+        """
+        self.alive[indices] = value
+        self.living = np.flatnonzero(self.alive)
+    
+    def update(self, next_obstacles_info, speed, indices=None):
+        """
+        Actualiza los dinosaurios: lee sensores, decide acción, ejecuta física.
+        
+        Args:
+            next_obstacles_info: array (n, 5) con [distancia, x, y, ancho, alto]
+                                 del siguiente obstáculo de cada dinosaurio
+            speed: velocidad actual del juego
+            indices: dinosaurios a actualizar (por defecto, los vivos)
+        """
+        if indices is None:
+            indices = self.alive_indices()
+        indices = np.atleast_1d(indices)
+        
+        self.update_brain_inputs(indices, next_obstacles_info, speed)
+        self.act(indices, self.think(indices))
+    
+    def think(self, indices):
+        """
+        Evalúa la red neuronal de los dinosaurios indicados con sus entradas actuales.
+        
+        Args:
+            indices: dinosaurios a evaluar
+        
+        Returns:
+            numpy array (n, 2) con las salidas (saltar, agacharse)
+        """
+        if self.brain_rows is None:
+            return self.brain.feed_forward(self.brain_inputs[indices], indices)
+        if len(indices) >= DENSE_BRAIN_FRACTION * self.size:
+            copies = self.brain_inputs.reshape(-1, self.brain.size, 7)
+            return self.brain.feed_forward_copies(copies).reshape(-1, 2)[indices]
+        return self.brain.feed_forward(self.brain_inputs[indices], self.brain_rows[indices])
+    
+    def act(self, indices, outputs):
+        """
+        Ejecuta las acciones decididas y avanza la física del salto un frame.
+        
+        Args:
+            indices: dinosaurios que actúan
+            outputs: array (n, 2) con [saltar, agacharse] (distinto de 0 = sí)
+        """
+        self.process_brain_output(indices, outputs)
+        self.update_jump(indices[self.jumping(indices)])
+    
+    def update_brain_inputs(self, indices, next_obstacles_info, speed):
+        """
+        Normaliza y actualiza las entradas de la red neuronal.
+        
+        Args:
+            indices: dinosaurios a actualizar
+            next_obstacles_info: array (n, 5) con [distancia, x, y, ancho, alto]
+            speed: velocidad del juego
+        """
+        info = np.asarray(next_obstacles_info)
+        inputs = self.brain_inputs
+        inputs[indices, 0] = info[:, 0] / 900                           # distancia normalizada
+        inputs[indices, 1] = (info[:, 1] - 450) / (1350 - 450)          # x normalizada
+        inputs[indices, 2] = (info[:, 2] - 370) / (480 - 370)           # y normalizada
+        inputs[indices, 3] = (info[:, 3] - 30) / (146 - 30)             # ancho normalizado
+        inputs[indices, 4] = (info[:, 4] - 40) / (96 - 40)              # alto normalizado
+        inputs[indices, 5] = (self.y_pos[indices] - 278) / (484 - 278)  # y del dino normalizada
+        inputs[indices, 6] = (speed - 15) / (30 - 15)                   # velocidad normalizada
+    
+    def process_brain_output(self, indices, outputs):
+        """
+        Procesa las salidas de la red neuronal para ejecutar acciones.
+        outputs[:, 0] = saltar
+        outputs[:, 1] = agacharse
+        
+        Args:
+            indices: dinosaurios a procesar
+            outputs: array (n, 2) con las salidas de cada red
+        """
+        wants_jump = outputs[:, 0] != 0
+        wants_crouch = outputs[:, 1] != 0
+        
+        # Saltar
+        can_jump = ~self.crouching(indices) & ~self.jumping(indices)
+        self.jump(indices[wants_jump & can_jump])
+        
+        # Dejar de agacharse
+        standing_up = indices[~wants_crouch]
+        self.stop_crouch(standing_up[self.crouching(standing_up)])
+        
+        # Agacharse (interrumpe el salto)
+        crouching = indices[wants_crouch]
+        self.stop_jump(crouching[self.jumping(crouching)])
+        self.crouch(crouching)
+    
+    def update_jump(self, indices):
+        """Actualiza la física del salto (parábola precalculada en JUMP_Y_POS)."""
+        frame = self.jump_frame[indices]
+        self.y_pos[indices] = JUMP_Y_POS[frame - 1]
+        frame += 1
+        self.jump_frame[indices] = frame
+        
+        self.stop_jump(indices[frame > JUMP_FRAMES])
+    
+    def jump(self, indices):
+        """Inicia el salto."""
+        self.jump_frame[indices] = 1
+        self.sprite_frame[indices] = 0
+    
+    def stop_jump(self, indices):
+        """Detiene el salto y vuelve al suelo."""
+        self.jump_frame[indices] = 0
+        self.y_pos[indices] = DINO_GROUND_Y
+        self.sprite_frame[indices] = 0
+    
+    def crouch(self, indices):
+        """Agacha a los dinosaurios que aún no lo están."""
+        indices = np.atleast_1d(indices)
+        indices = indices[~self.crouching(indices)]
+        self.y_pos[indices] = DINO_CROUCH_Y
+        self.obj_width[indices] = DINO_CROUCH_WIDTH
+        self.obj_height[indices] = DINO_CROUCH_HEIGHT
+        self.sprite_frame[indices] = 0
+    
+    def stop_crouch(self, indices):
+        """Deja de agacharse."""
+        self.y_pos[indices] = DINO_GROUND_Y
+        self.obj_width[indices] = DINO_WIDTH
+        self.obj_height[indices] = DINO_HEIGHT
+        self.sprite_frame[indices] = 0
+    
+    def jumping(self, indices=slice(None)):
+        """Máscara de los dinosaurios indicados (por defecto, todos) que están saltando."""
+        return self.jump_frame[indices] > 0
+    
+    def crouching(self, indices=slice(None)):
+        """Máscara de los dinosaurios indicados (por defecto, todos) que están agachados."""
+        return self.obj_width[indices] == DINO_CROUCH_WIDTH
+    
+    def die(self, indices, sim_score):
+        """
+        Mata a los dinosaurios indicados y guarda su score.
+        
+        Args:
+            indices: dinosaurios que mueren
+            sim_score: score de la simulación cuando murieron
+        """
+        self.alive[indices] = False
+        self.score[indices] = sim_score
+        
+        # Estadísticas online: todos los que mueren a la vez tienen el mismo score
+        count = len(indices)
+        if count:
+            self.living = self.living[~np.isin(self.living, indices)]
+            sim_score = int(sim_score)
+            if self.deaths and sim_score < self.score_max:
+                self.deaths_in_order = False
+            self.scored += count
+            self.score_sum += count * sim_score
+            self.score_sum_squares += count * sim_score * sim_score
+            self.score_min = sim_score if self.score_min is None else min(self.score_min, sim_score)
+            self.score_max = sim_score if self.score_max is None else max(self.score_max, sim_score)
+            self.deaths.append((sim_score, np.array(indices, dtype=np.intp)))
+    
+    def clear_score_stats(self):
+        """Vacía las estadísticas de score acumuladas al morir."""
+        self.scored = 0
+        self.score_sum = 0
+        self.score_sum_squares = 0
+        self.score_min = None
+        self.score_max = None
+        # Muertes en orden: (score, índices); el score nunca baja en una generación
+        self.deaths = []
+        self.deaths_in_order = True
+    
+    def scores_complete(self):
+        """True si todos los dinosaurios murieron una sola vez y sus scores están acumulados."""
+        return self.scored == self.size and self.size > 0 and len(self.living) == 0
+    
+    def score_stats(self):
+        """
+        Estadísticas de score de la generación. Si todos los scores se
+        registraron al morir salen de los acumuladores, sin recorrer la
+        población; si no, se calculan sobre el array. Con scores enteros la
+        varianza sale de sumas enteras exactas.
+        
+        Returns:
+            tuple: (suma, máximo, mínimo, varianza)
+        """
+        if self.scores_complete():
+            total, total_squares = self.score_sum, self.score_sum_squares
+            max_score, min_score = self.score_max, self.score_min
+        elif not np.issubdtype(self.score.dtype, np.integer):
+            # Fitness agregada de varios recorridos (p. ej. la media): no es entera
+            scores = self.score
+            return float(scores.sum()), float(scores.max()), float(scores.min()), float(scores.var())
+        else:
+            scores = self.score.astype(np.int64)
+            total, total_squares = int(scores.sum()), int(np.dot(scores, scores))
+            max_score, min_score = int(scores.max()), int(scores.min())
+        
+        # Varianza exacta con enteros: (n * sum(x^2) - sum(x)^2) / n^2
+        n = self.size
+        variance = (n * total_squares - total * total) / (n * n)
+        return total, max_score, min_score, variance
+    
+    def ranking(self, k):
+        """
+        Los k mejores dinosaurios, de mayor a menor score. Los empates se
+        ordenan por índice, igual que un argsort estable de todo el array.
+        Como mueren en orden de score, basta con mirar las últimas muertes.
+        
+        Args:
+            k: número de dinosaurios
+        
+        Returns:
+            numpy array con los índices de los k mejores
+        """
+        if not (self.scores_complete() and self.deaths_in_order):
+            return np.argsort(-self.score, kind="stable")[:k]
+        
+        # Últimas muertes hasta tener k, más las que empatan con la última tomada
+        candidates = []
+        collected = 0
+        boundary = None
+        for score, indices in reversed(self.deaths):
+            if collected >= k and score != boundary:
+                break
+            candidates.append(indices)
+            collected += len(indices)
+            boundary = score
+        candidates = np.concatenate(candidates)
+        order = np.lexsort((candidates, -self.score[candidates]))
+        return candidates[order[:k]]
+    
+    def reset(self, indices=slice(None)):
+        """
+        Resetea la población para la siguiente generación: todos vivos, sin
+        score y de pie en el suelo, así cada generación empieza igual.
+        
+        Args:
+            indices: dinosaurios a resetear (por defecto, todos)
+        """
+        self.alive[indices] = True
+        self.living = np.flatnonzero(self.alive)
+        self.score[indices] = 0
+        self.y_pos[indices] = DINO_GROUND_Y
+        self.obj_width[indices] = DINO_WIDTH
+        self.obj_height[indices] = DINO_HEIGHT
+        self.jump_frame[indices] = 0
+        self.sprite_frame[indices] = 0
+        if isinstance(indices, slice) and indices == slice(None):
+            self.clear_score_stats()
+    
+    def toggle_sprites(self):
+        """Alterna el fotograma de animación de los dinosaurios vivos."""
+        self.sprite_frame[self.living] ^= 1
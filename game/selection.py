@@ -0,0 +1,148 @@
+"""
+Operadores de selección de padres que sortean todos los padres de una
+generación a la vez sobre el array de scores.
+"""
+import numpy as np
+
+
+# Elementos como máximo de cada bloque de claves aleatorias (unos 32 MB)
+CHUNK_ELEMENTS = 1 << 22
+
+
+def sample_distinct(size, count, k, rng):
+    """
+    Sortea count filas de k índices distintos entre 0 y size - 1, con
+    memoria proporcional a count * k (no a count * size).
+    - 2k <= size: se sortea la matriz (count, k) y solo se vuelven a
+      sortear las posiciones repetidas; cada vuelta repite menos de la
+      mitad, así que termina en pocas vueltas. Como la regla no depende de
+      los valores, cada fila es un subconjunto uniforme.
+    - k mayor: los k primeros de una permutación aleatoria por fila
+      (argpartition de claves uniformes), por bloques de filas para acotar
+      la memoria (la salida ya ocupa más de la mitad de count * size)
+    
+    Args:
+        size: número de individuos
+        count: número de filas
+        k: índices por fila
+        rng: numpy.random.Generator
+    
+    Returns:
+        numpy array (count, k) de índices
+    """
+    if 2 * k > size:
+        samples = np.empty((count, k), dtype=np.intp)
+        block_rows = max(1, CHUNK_ELEMENTS // size)
+        for start in range(0, count, block_rows):
+            keys = rng.random((min(block_rows, count - start), size))
+            samples[start:start + block_rows] = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        return samples
+    
+    samples = rng.integers(0, size, (count, k))
+    # Por bloques de filas: los temporales de la ordenación no crecen con count
+    block_rows = max(1, CHUNK_ELEMENTS // k)
+    for start in range(0, count, block_rows):
+        block = samples[start:start + block_rows]
+        ordered = np.sort(block, axis=1)
+        pending = np.nonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))[0]
+        while len(pending):
+            # Repetidos: cada valor después de su primera aparición en la fila
+            rows = block[pending]
+            order = np.argsort(rows, axis=1, kind="stable")
+            ordered = np.take_along_axis(rows, order, axis=1)
+            repeated = ordered[:, 1:] == ordered[:, :-1]
+            positions = np.nonzero(repeated)[0]
+            block[pending[positions], order[:, 1:][repeated]] = rng.integers(0, size, len(positions))
+            # Solo las filas que se han vuelto a sortear pueden tener repetidos
+            pending = pending[repeated.any(axis=1)]
+    return samples
+
+
+def tournament_selection(scores, count, rng, k=5):
+    """
+    Selección por torneo: cada padre es el mejor de k individuos distintos
+    elegidos al azar. Todos los torneos se sortean como una matriz de
+    índices (count, k) sin reemplazo:
+    - k pequeño frente a la población (k * (k - 1) <= tamaño): se sortean
+      índices y se vuelven a sortear las filas con algún repetido (casi
+      nunca hace falta)
+    - k grande: sample_distinct, con memoria proporcional a count * k y no
+      a count * tamaño. Este camino consume el generador de otra forma, así
+      que con la misma semilla sortea torneos distintos a los del primero.
+    
+    Args:
+        scores: numpy array con el score de cada dinosaurio
+        count: número de padres a elegir
+        rng: numpy.random.Generator
+        k: participantes por torneo
+    
+    Returns:
+        numpy array con los índices de los padres
+    """
+    size = len(scores)
+    if not 0 < k <= size:
+        raise ValueError(f"El torneo necesita entre 1 y {size} participantes, no {k}")
+    
+    if k * (k - 1) > size:
+        competitors = sample_distinct(size, count, k, rng)
+    else:
+        competitors = rng.integers(0, size, (count, k))
+        while k > 1:
+            ordered = np.sort(competitors, axis=1)
+            repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not repeated.any():
+                break
+            competitors[repeated] = rng.integers(0, size, (int(repeated.sum()), k))
+    
+    # Gana el de mayor score (en empate, el primero sorteado)
+    winners = np.argmax(scores[competitors], axis=1)
+    return competitors[np.arange(count), winners]
+
+
+def roulette_selection(scores, count, rng, k=None):
+    """
+    Selección por ruleta: probabilidad proporcional al score.
+    Si todos los scores son 0, la elección es uniforme.
+    
+    Args:
+        scores: numpy array con el score de cada dinosaurio (no negativos)
+        count: número de padres a elegir
+        rng: numpy.random.Generator
+        k: no se usa (misma firma que tournament_selection)
+    
+    Returns:
+        numpy array con los índices de los padres
+    """
+    weights = np.asarray(scores, dtype=float)
+    total = weights.sum()
+    probabilities = weights / total if total > 0 else None
+    return rng.choice(len(weights), count, p=probabilities)
+
+
+def rank_selection(scores, count, rng, k=None):
+    """
+    Selección por ranking lineal: el peor tiene peso 1 y el mejor peso N,
+    sin importar cuánto se separan sus scores. Los empates se ordenan por
+    índice (ordenamiento estable).
+    
+    Args:
+        scores: numpy array con el score de cada dinosaurio
+        count: número de padres a elegir
+        rng: numpy.random.Generator
+        k: no se usa (misma firma que tournament_selection)
+    
+    Returns:
+        numpy array con los índices de los padres
+    """
+    size = len(scores)
+    ranks = np.empty(size)
+    ranks[np.argsort(scores, kind="stable")] = np.arange(1, size + 1)
+    return rng.choice(size, count, p=ranks / ranks.sum())
+
+
+# Nombre -> operador de selección
+SELECTION_METHODS = {
+    "tournament": tournament_selection,
+    "roulette": roulette_selection,
+    "rank": rank_selection,
+}
@@ -1,11 +1,21 @@
 """
 Simulación principal del juego con algoritmo genético.
 """
-import random
+import time
 import pygame
 from game.dino import Dino
+from game.population import Population
+from neural_network.genome import GenomeBatch
+from neural_network.brain_cache import BrainCache
+from game.collisions import enemy_boxes
+from game.obstacles import ObstacleIndex
+from game.selection import SELECTION_METHODS, tournament_selection
 from game.enemy import Cactus, Bird
 from game.game_object import Ground
+from game.hud import Hud
+from game.backends import DEFAULT_BACKEND, get_backend
+from utils.random_streams import RandomStreams
+from utils.profiler import Profiler
 import numpy as np
 
 
@@ -13,6 +23,15 @@ import numpy as np
 DINOS_PER_GENERATION = 500
 MIN_SPAWN_MILLIS = 1000
 MAX_SPAWN_MILLIS = 3000
+FIRST_GENERATION_SPEED = 10
+GENERATION_SPEED = 15
+TOURNAMENT_SIZE = 5
+
+# Reloj simulado (modo de paso fijo)
+TICKS_PER_SECOND = 60
+MILLIS_PER_TICK = 1000 / TICKS_PER_SECOND
+TICKS_PER_TENTH = 6      # 0.1 s a 60 ticks por segundo
+TICKS_PER_QUARTER = 15   # 0.25 s a 60 ticks por segundo
 
 
 class Simulation:
@@ -24,34 +43,298 @@ class Simulation:
     - Algoritmo genético
     """
     
-    def __init__(self):
+    def __init__(self, fixed_timestep=False, population_size=DINOS_PER_GENERATION,
+                 seed=None, population=None, generation=1, fixed_course=False,
+                 metrics_log=None, keep_history=True, selection="tournament",
+                 tournament_size=TOURNAMENT_SIZE, courses=1, fitness="mean",
+                 backend=DEFAULT_BACKEND, snapshots=None, brain_cache=False):
+        """
+        Args:
+            fixed_timestep: si es True la simulación avanza con un contador de
+                ticks simulado (sin reloj real ni pantalla), útil para entrenar
+                en modo headless tan rápido como permita la CPU
+            population_size: número de dinosaurios por generación
+            seed: semilla de todos los flujos aleatorios (recorrido, genomas,
+                mutación, selección y posición); con la misma semilla el
+                historial de generaciones es idéntico bit a bit
+            population: población inicial ya creada (por defecto, una aleatoria)
+            generation: número de la generación inicial
+            fixed_course: si es True todas las generaciones juegan el mismo
+                recorrido de obstáculos, así un genoma repetido obtiene
+                siempre el mismo score
+            metrics_log: MetricsLog opcional donde escribir las estadísticas
+                de cada generación en cuanto termina
+            keep_history: si es False no se acumula generation_data en
+                memoria (útil con metrics_log en ejecuciones muy largas)
+            selection: operador de selección de padres ("tournament",
+                "roulette" o "rank")
+            tournament_size: participantes por torneo
+            courses: recorridos independientes que juega cada generación a
+                la vez (solo con paso fijo); con más de uno, el score de
+                cada dinosaurio es la fitness agregada de todos ellos
+            fitness: cómo se agregan los scores de varios recorridos
+                ("mean", "min" o un cuantil entre 0 y 1)
+            backend: backend del paso de la población ("numpy", "numba" o
+                "auto"); todos dan los mismos resultados
+            snapshots: SnapshotPublisher opcional donde publicar el estado
+                de los frames para un visor en otro proceso
+            brain_cache: si es True los cerebros se construyen con un
+                BrainCache; por defecto se construyen con scatter_genes,
+                que es más rápido salvo con muchos genomas repetidos
+        """
+        from game.courses import check_fitness
+        if selection not in SELECTION_METHODS:
+            raise ValueError(f"Selección desconocida: {selection}")
+        if courses < 1:
+            raise ValueError(f"Se necesita al menos un recorrido, no {courses}")
+        if courses > 1 and not fixed_timestep:
+            raise ValueError("Jugar varios recorridos a la vez necesita una simulación con paso fijo")
+        check_fitness(fitness)
+        self.fixed_timestep = fixed_timestep
+        self.fixed_course = fixed_course
+        self.selection = selection
+        self.tournament_size = tournament_size
+        self.courses = courses
+        self.fitness = fitness
+        self.backend = get_backend(backend)
+        self.streams = RandomStreams(seed)
+        self.seed = self.streams.seed
+        self.ticks = 0
+        self.generation_ticks = 0
+        
+        # Tiempos por fase (desactivado hasta que se active profiler.enabled):
+        # obstacle_index, dinos (sensores, red y física en el backend), enemies,
+        # spawn, collisions, ground, frame, next_generation y draw
+        self.profiler = Profiler()
+        
+        # Cerebros ya construidos, compartidos por genomas idénticos (opcional)
+        self.brain_cache = BrainCache() if brain_cache else None
+        
         # Crear población inicial
-        self.dinos = [Dino() for _ in range(DINOS_PER_GENERATION)]
+        self.population_size = population_size
+        if population is None:
+            population = self.new_population(population_size)
+        self.population = population
         self.enemies = []
         self.generation_data = []
+        self.metrics_log = metrics_log
+        self.snapshots = snapshots
+        self.keep_history = keep_history
+        self.last_generation_stats = None
         
         # Estado del juego
-        self.speed = 10
         self.ground = Ground()
-        self.score = 0
-        self.generation = 1
+        self.hud = Hud()
+        self.generation = generation
         self.last_gen_avg_score = 0
         self.last_gen_max_score = 0
-        self.dinos_alive = DINOS_PER_GENERATION
+        self.dinos_alive = int(np.count_nonzero(population.alive))
         self.best_weights=None
         self.best_dino_alive=None
         self.best_score_dino=0
         
+        # Recorrido de obstáculos de la primera generación
+        self.start_generation()
+        
+        # Control de eventos periódicos en tiempo real
+        self.tenth_counter = 0
+        self.last_tenth_time = self.current_millis()
+    
+    def current_millis(self):
+        """
+        Devuelve el tiempo actual de la simulación en milisegundos.
+        
+        Returns:
+            float: milisegundos simulados en modo de paso fijo,
+                   milisegundos reales de pygame en otro caso
+        """
+        if self.fixed_timestep:
+            return self.generation_ticks * MILLIS_PER_TICK
+        return pygame.time.get_ticks()
+    
+    def start_generation(self):
+        """
+        Prepara el recorrido de la generación actual: sin enemigos, velocidad
+        inicial, score a cero y el reloj de spawn reiniciado.
+        """
+        course_generation, self.speed = self.course_key()
+        self.score = 0
+        self.enemies.clear()
+        self.generation_ticks = 0
+        self.generation_start_time = time.perf_counter()
+        
+        # Recorrido reproducible (propio de cada generación salvo con fixed_course)
+        self.course_random = self.streams.course(course_generation)
+        
         # Control de spawn de enemigos
-        self.last_spawn_time = pygame.time.get_ticks()
-        self.time_to_spawn = random.uniform(MIN_SPAWN_MILLIS, MAX_SPAWN_MILLIS)
+        self.last_spawn_time = self.current_millis()
+        self.time_to_spawn = self.course_random.uniform(MIN_SPAWN_MILLIS, MAX_SPAWN_MILLIS)
+    
+    def course_key(self):
+        """
+        Identifica el recorrido de la generación actual: dos generaciones con
+        la misma clave (y la misma semilla) juegan los mismos obstáculos a la
+        misma velocidad.
+        
+        Returns:
+            tuple: (generación del recorrido, velocidad inicial)
+        """
+        course_generation = 1 if self.fixed_course else self.generation
+        speed = FIRST_GENERATION_SPEED if self.generation == 1 else GENERATION_SPEED
+        return course_generation, speed
+    
+    def step(self):
+        """
+        Avanza la simulación un frame y dispara los eventos periódicos
+        (décima y cuarto de segundo) según el reloj de la simulación.
+        """
+        generation = self.generation
+        self.update()
+        
+        # El primer frame de una generación nueva empieza en el tick 0
+        if self.generation == generation:
+            self.advance_clock()
+    
+    def advance_clock(self):
+        """Avanza el reloj un tick y dispara los eventos periódicos que tocan."""
+        self.ticks += 1
+        self.generation_ticks += 1
+        
+        if self.fixed_timestep:
+            if self.generation_ticks % TICKS_PER_TENTH == 0:
+                self.tenth_of_second()
+            if self.generation_ticks % TICKS_PER_QUARTER == 0:
+                self.quarter_of_second()
+            return
+        
+        # Eventos periódicos (cada 50ms de tiempo real)
+        current_time = self.current_millis()
+        if current_time - self.last_tenth_time > 50:
+            self.last_tenth_time = current_time
+            self.tenth_counter += 1
+            
+            # Cada 0.1 segundos
+            if self.tenth_counter % 2 == 0:
+                self.tenth_of_second()
+            
+            # Cada 0.25 segundos
+            if self.tenth_counter % 5 == 0:
+                self.quarter_of_second()
+    
+    def new_population(self, size, genomes=None):
+        """
+        Crea dinosaurios nuevos con los flujos aleatorios de la simulación.
+        
+        Args:
+            size: número de dinosaurios
+            genomes: GenomeBatch opcional (por defecto, genomas aleatorios)
+        
+        Returns:
+            Population: población nueva
+        """
+        return Population(size, genomes, placement_rng=self.streams.placement,
+                          genome_rng=self.streams.genome, brain_cache=self.brain_cache)
+    
+    @property
+    def dinos(self):
+        """Vistas Dino de la población actual (para dibujar e inspeccionar)."""
+        return self.population.dinos()
     
     def update(self):
         """Actualiza toda la simulación en cada frame."""
-        # Actualizar dinosaurios vivos
-        for dino in self.dinos:
-            if dino.alive:
-                dino.update(self.next_obstacle_info(dino), int(self.speed))
+        self.update_frame()
+        
+        # Si todos murieron, nueva generación
+        if self.dinos_alive == 0:
+            self.next_generation()
+    
+    def play_generation(self):
+        """
+        Juega la generación actual con el reloj simulado hasta que mueren
+        todos los dinosaurios, sin crear la siguiente generación. Con varios
+        recorridos se juegan todos a la vez (CourseBatch) y el score de cada
+        dinosaurio es su fitness agregada.
+        
+        Returns:
+            numpy array con el score de cada dinosaurio
+        """
+        if self.courses > 1:
+            from game.courses import CourseBatch, aggregate_fitness
+            scores = CourseBatch(self, self.courses).play()
+            self.population.score = aggregate_fitness(scores, self.fitness)
+            self.population.set_alive(slice(None), False)
+            self.dinos_alive = 0
+            return self.population.score.copy()
+        
+        while self.dinos_alive > 0:
+            self.update_frame()
+            if self.dinos_alive > 0:
+                self.advance_clock()
+        return self.population.score.copy()
+    
+    def run_generation(self, evaluator=None):
+        """
+        Juega la generación completa y crea la siguiente.
+        
+        Args:
+            evaluator: evaluador opcional (p. ej. ParallelEvaluator) que juega
+                la generación fuera de este proceso y devuelve los scores
+        """
+        if evaluator is None:
+            self.play_generation()
+        else:
+            scores = evaluator.evaluate(self)
+            self.population.score = np.asarray(scores)
+            self.population.set_alive(slice(None), False)
+            self.dinos_alive = 0
+        self.next_generation()
+    
+    def update_frame(self):
+        """
+        Actualiza dinosaurios, enemigos y colisiones durante un frame.
+        Con varios recorridos no hay un frame único: las generaciones se
+        juegan enteras con play_generation o run_generation.
+        """
+        if self.courses > 1:
+            raise ValueError("Con varios recorridos la generación se juega con play_generation "
+                             "o run_generation, no frame a frame")
+        profiler = self.profiler
+        frame_start = start = profiler.clock()
+        
+        # Actualizar dinosaurios vivos (sensores, red y física en el backend)
+        alive = self.population.alive_indices()
+        obstacles = ObstacleIndex(self.enemies)
+        start = profiler.lap("obstacle_index", start)
+        self.backend.update(self.population, alive, obstacles, int(self.speed))
+        profiler.lap("dinos", start)
+        
+        self.update_world()
+        profiler.lap("frame", frame_start)
+        
+        # Foto del frame para un visor externo (limitada a unas decenas por segundo)
+        if self.snapshots is not None:
+            self.snapshots.maybe_publish(self)
+    
+    def sense(self, indices):
+        """
+        Lee los sensores (siguiente obstáculo y velocidad) de los dinosaurios
+        indicados y los deja normalizados en population.brain_inputs.
+        
+        Args:
+            indices: dinosaurios vivos
+        """
+        obstacles = ObstacleIndex(self.enemies)
+        next_obstacles_info = obstacles.next_obstacles_info(self.population.x_pos[indices])
+        self.population.update_brain_inputs(indices, next_obstacles_info, int(self.speed))
+    
+    def update_world(self):
+        """
+        Avanza el mundo un frame después de que actúen los dinosaurios:
+        enemigos, spawn, colisiones (los que chocan mueren con el score
+        actual), suelo y velocidad.
+        """
+        profiler = self.profiler
+        start = profiler.clock()
         
         # Actualizar enemigos
         enemies_to_remove = []
@@ -63,39 +346,34 @@ class Simulation:
         # Remover enemigos fuera de pantalla
         for enemy in enemies_to_remove:
             self.enemies.remove(enemy)
+        start = profiler.lap("enemies", start)
         
         # Spawn de nuevos enemigos
-        current_time = pygame.time.get_ticks()
+        current_time = self.current_millis()
         if current_time - self.last_spawn_time > self.time_to_spawn:
             self.spawn_enemy()
             self.last_spawn_time = current_time
-            self.time_to_spawn = random.uniform(MIN_SPAWN_MILLIS, MAX_SPAWN_MILLIS)
+            self.time_to_spawn = self.course_random.uniform(MIN_SPAWN_MILLIS, MAX_SPAWN_MILLIS)
+        start = profiler.lap("spawn", start)
         
         # Verificar colisiones
         self.check_collisions()
+        start = profiler.lap("collisions", start)
         
         # Actualizar suelo y velocidad
         self.ground.update(int(self.speed))
         self.speed += 0.001
+        profiler.lap("ground", start)
     
     
     def check_collisions(self):
         """Verifica colisiones entre dinosaurios y enemigos."""
-        self.dinos_alive = 0
-        
-        for dino in self.dinos:
-            if dino.alive:
-                for enemy in self.enemies:
-                    if dino.is_collisioning_with(enemy):
-                        dino.die(self.score)
-                        break
-                
-                if dino.alive:
-                    self.dinos_alive += 1
+        population = self.population
+        alive = population.alive_indices()
+        colliding = self.backend.collisions(population, alive, enemy_boxes(self.enemies))
         
-        # Si todos murieron, nueva generación
-        if self.dinos_alive == 0:
-            self.next_generation()
+        population.die(alive[colliding], self.score)
+        self.dinos_alive = len(alive) - int(np.count_nonzero(colliding))
     
     
 
@@ -108,105 +386,99 @@ class Simulation:
         - 40% mutaciones del top 5%
         - 20% crossover del top 5%
         """
-        self.score = 0
+        start = self.profiler.clock()
         self.generation += 1
-        self.speed = 15
-        self.enemies.clear()
         
-        # Calcular estadísticas
-        dinos_score_sum = sum(dino.score for dino in self.dinos)
-        max_score=0
-        min_score=1e18
-        suma=0
-        values=[]
-        for dino in self.dinos:
-            max_score=max(max_score,dino.score)
-            min_score=min(min_score,dino.score)
-            suma+=dino.score
-            values.append(dino.score)
-        avg_score=suma/len(self.dinos)
-        varianza=np.var(values)
-        desviacion=np.std(values)
-        self.generation_data.append([self.generation-1, max_score, avg_score, min_score,varianza,desviacion])
-        
-
-            
-        self.last_gen_avg_score = dinos_score_sum // DINOS_PER_GENERATION
+        # Calcular estadísticas (acumuladas mientras morían los dinosaurios)
+        population = self.population
+        dinos_score_sum, max_score, min_score, varianza = population.score_stats()
+        avg_score = dinos_score_sum / population.size
+        desviacion = float(np.sqrt(varianza))
+        if self.keep_history:
+            self.generation_data.append([self.generation-1, max_score, avg_score, min_score, varianza, desviacion])
+        
+        wall_seconds = time.perf_counter() - self.generation_start_time
+        self.last_generation_stats = {
+            "generation": self.generation - 1,
+            "max_score": max_score,
+            "avg_score": avg_score,
+            "min_score": min_score,
+            "variance": varianza,
+            "std": desviacion,
+            "wall_seconds": wall_seconds,
+            "evaluations_per_second": population.size / wall_seconds if wall_seconds > 0 else 0.0,
+        }
+        if self.metrics_log is not None:
+            self.metrics_log.write(self.last_generation_stats)
+        
+        self.last_gen_avg_score = dinos_score_sum // self.population_size
+        
+        # Los mejores por score (mejor a peor, estable como list.sort)
+        top_5_percent = int(self.population_size * 0.05)
+        ranking = population.ranking(max(top_5_percent, 1))
+        best = ranking[0]
+        # Con varios recorridos la fitness agregada es float: no se trunca
+        best_score = population.score[best]
+        self.last_gen_max_score = int(best_score) if self.courses == 1 else float(best_score)
         
-        # Ordenar por score (mejor a peor)
-        self.dinos.sort(reverse=True)
-        self.last_gen_max_score = self.dinos[0].score
-
         if self.best_score_dino<self.last_gen_max_score:
-            self.best_dino_alive=self.dinos[0]
-            self.best_score_dino=self.dinos[0].score
+            self.best_dino_alive = Dino(population.select([best]))
+            self.best_score_dino = self.last_gen_max_score
+        
+        # Crear nueva generación (el caché cuenta solo los cerebros de esta)
+        if self.brain_cache is not None:
+            self.brain_cache.reset_stats()
+        new_parts = []
         
-        # Crear nueva generación
-        new_dinos = []
-        new_dinos.append(self.best_dino_alive)
-        top_5_percent = int(DINOS_PER_GENERATION * 0.05)
+        # El mejor dinosaurio visto hasta ahora vuelve a competir
+        if self.best_dino_alive is not None:
+            new_parts.append(self.best_dino_alive.population.select([0]))
         
         # 5% mejores sin cambios
-        for i in range(top_5_percent):
-            self.dinos[i].reset()
-            new_dinos.append(self.dinos[i])
+        new_parts.append(population.select(ranking[:top_5_percent]))
         
         # 5% completamente nuevos
-        for _ in range(top_5_percent):
-            new_dinos.append(Dino())
+        new_parts.append(self.new_population(top_5_percent))
+        
+        genomes = population.genomes
         
         # 30% mutaciones del mejor
-        for _ in range(int(DINOS_PER_GENERATION * 0.3)):
-            #Seleccion por torneo
-            # candidates = random.sample(self.dinos, 5)
-            # father=max(candidates, key=lambda d: d.score)
-            father=self.dinos[0]
-            son = Dino()
-            son.genome = father.genome.mutate()
-            son.init_brain()
-            new_dinos.append(son)
+        #Seleccion por torneo
+        # fathers = [self.select_parent_tournament(5) for _ in range(int(self.population_size * 0.3))]
+        fathers = np.full(int(self.population_size * 0.3), best)
+        best_mutations = genomes.mutate(fathers, self.streams.mutation)
         
         # 40% mutaciones del top 5% o hacemos seleccion por ruleta
-        for _ in range(int(DINOS_PER_GENERATION * 0.4)):
-            father = self.select_parent_tournament(5)
-            son = Dino()
-            son.genome = father.genome.mutate()
-            son.init_brain()
-            new_dinos.append(son)
-        
-        # 20% crossover del top 5%
-        for _ in range(int(DINOS_PER_GENERATION * 0.2)):
-            father = self.select_parent_tournament(5)
-            mother = self.select_parent_tournament(5)
-            son = Dino()
-            son.genome = father.genome.crossover(mother.genome)
-            son.init_brain()
-            new_dinos.append(son)
-        
-        self.dinos = new_dinos
+        fathers = self.select_parents(int(self.population_size * 0.4))
+        tournament_mutations = genomes.mutate(fathers, self.streams.mutation)
+        
+        # 20% crossover del top 5% (padre y madre alternados)
+        parents = self.select_parents(2 * int(self.population_size * 0.2))
+        crossovers = genomes.crossover(parents[0::2], parents[1::2], self.streams.mutation)
+        
+        children = GenomeBatch.concatenate([best_mutations, tournament_mutations, crossovers])
+        new_parts.append(self.new_population(len(children), children))
+        
+        self.population = Population.concatenate(new_parts)
+        self.population.reset()
+        self.dinos_alive = self.population.size
+        
+        self.start_generation()
+        self.profiler.lap("next_generation", start)
+        self.profiler.end_generation(self.generation - 1)
     
-    def next_obstacle_info(self, dino):
+    def next_obstacle_info(self, x_pos):
         """
         Encuentra el siguiente obstáculo para un dinosaurio.
         
         Args:
-            dino: el dinosaurio
+            x_pos: posición x del dinosaurio
             
         Returns:
             list: [distancia, x, y, ancho, alto]
         """
-        result = [1280, 0, 0, 0, 0]
-        
-        for enemy in self.enemies:
-            if enemy.x_pos > dino.x_pos:
-                result[0] = enemy.x_pos - dino.x_pos
-                result[1] = enemy.x_pos
-                result[2] = enemy.y_pos
-                result[3] = enemy.obj_width
-                result[4] = enemy.obj_height
-                break
-        
-        return result
+        obstacles = ObstacleIndex(self.enemies)
+        return obstacles.next_obstacles_info(np.array([x_pos]))[0].tolist()
     
     def draw(self, screen, sprites, font, small_font):
         """
@@ -218,6 +490,8 @@ class Simulation:
             font: fuente grande
             small_font: fuente pequeña
         """
+        start = self.profiler.clock()
+        
         # Dibujar suelo
         self.ground.draw(screen, sprites)
         
@@ -226,12 +500,12 @@ class Simulation:
             enemy.draw(screen, sprites)
         
         # Dibujar dinosaurios vivos
-        for dino in self.dinos:
-            if dino.alive:
-                dino.draw(screen, sprites)
+        for i in self.population.alive_indices():
+            Dino(self.population, i).draw(screen, sprites)
         
         # Dibujar información
         self.draw_info(screen, font, small_font)
+        self.profiler.lap("draw", start)
     
     def draw_info(self, screen, font, small_font):
         """
@@ -242,22 +516,15 @@ class Simulation:
             font: fuente grande
             small_font: fuente pequeña
         """
-        # Score
-        score_text = font.render(str(self.score), True, (0, 0, 0))
-        screen.blit(score_text, (1200, 80))
+        # Score (los textos solo se renderizan de nuevo cuando cambian)
+        hud = self.hud
+        hud.draw_text(screen, font, str(self.score), (1200, 80))
         
         # Información de generación
-        gen_text = font.render(f"Generation: {self.generation}", True, (0, 0, 0))
-        screen.blit(gen_text, (80, 80))
-        
-        avg_text = font.render(f"Average Score (last gen): {self.last_gen_avg_score}", True, (0, 0, 0))
-        screen.blit(avg_text, (80, 120))
-        
-        max_text = font.render(f"Max Score (last gen): {self.last_gen_max_score}", True, (0, 0, 0))
-        screen.blit(max_text, (80, 160))
-        
-        alive_text = font.render(f"Alive: {self.dinos_alive}", True, (0, 0, 0))
-        screen.blit(alive_text, (80, 200))
+        hud.draw_text(screen, font, f"Generation: {self.generation}", (80, 80))
+        hud.draw_text(screen, font, f"Average Score (last gen): {self.last_gen_avg_score:g}", (80, 120))
+        hud.draw_text(screen, font, f"Max Score (last gen): {self.last_gen_max_score:g}", (80, 160))
+        hud.draw_text(screen, font, f"Alive: {self.dinos_alive}", (80, 200))
         
         # Dibujar red neuronal del primer dino vivo
         self.draw_network(screen, small_font)
@@ -270,18 +537,16 @@ class Simulation:
             screen: superficie de pygame
             font: fuente para texto
         """
-        for dino in self.dinos:
-            if dino.alive:
-                dino.brain.draw(screen, font)
-                self.best_weights=dino.brain.get_weights()
-                break
+        alive = self.population.alive_indices()
+        if len(alive) > 0:
+            brain = Dino(self.population, alive[0]).brain
+            self.hud.draw_network(screen, brain, font)
+            self.best_weights=brain.get_weights()
     
     def tenth_of_second(self):
         """Ejecuta acciones cada décima de segundo."""
         # Alternar sprites de dinosaurios
-        for dino in self.dinos:
-            if dino.alive:
-                dino.toggle_sprite()
+        self.population.toggle_sprites()
         
         # Incrementar score
         self.score += 1
@@ -294,12 +559,30 @@ class Simulation:
     
     def spawn_enemy(self):
         """Genera un enemigo aleatorio (cactus o pájaro)."""
-        if random.random() < 0.5:
-            self.enemies.append(Cactus())
+        if self.course_random.random() < 0.5:
+            self.enemies.append(Cactus(self.course_random))
         else:
-            self.enemies.append(Bird())
+            self.enemies.append(Bird(self.course_random))
 
+    def select_parents(self, count):
+        """
+        Elige todos los padres de un bloque de la generación de una vez con
+        el operador de selección configurado.
+        
+        Args:
+            count: número de padres
+        
+        Returns:
+            numpy array con los índices de los padres en la población
+        """
+        select = SELECTION_METHODS[self.selection]
+        return select(self.population.score, count, self.streams.selection, self.tournament_size)
+    
     def select_parent_tournament(self, k=5):
-        """Selecciona un padre por torneo (elige k individuos al azar y toma el mejor)."""
-        competitors = random.sample(self.dinos, k)
-        return max(competitors, key=lambda d: d.score)
+        """
+        Selecciona un padre por torneo (elige k individuos al azar y toma el mejor).
+        
+        Returns:
+            int: índice del padre en la población
+        """
+        return tournament_selection(self.population.score, 1, self.streams.selection, k)[0]
@@ -0,0 +1,390 @@
+"""
+Snapshots de la simulación en un buffer circular de memoria compartida.
+
+El proceso que entrena publica, como mucho unas decenas de veces por
+segundo de reloj real, una foto compacta de cada frame: posiciones y
+sprites de los dinosaurios vivos y de los enemigos, las estadísticas del
+HUD y los pesos y activaciones del cerebro que se muestra. Un visor en
+otro proceso (snapshot_viewer.py) se conecta al buffer por su nombre, lee
+el último snapshot completo y lo dibuja a su propio ritmo. El entrenamiento
+nunca espera al visor: publicar cuesta lo mismo haya o no alguien mirando,
+y el visor puede conectarse y desconectarse en cualquier momento.
+
+Cada ranura del buffer lleva un número de secuencia (impar mientras se
+escribe); el lector solo acepta una copia si la secuencia es par y no
+cambió durante la copia. La cabecera lleva un identificador de sesión y
+una marca de cierre, así el visor detecta que el entrenamiento terminó o
+se reinició y vuelve a esperar el buffer.
+"""
+import os
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from game.population import DINO_CROUCH_WIDTH
+from neural_network.brain import Brain
+
+
+# Formato del buffer
+SNAPSHOT_MAGIC = 0x44494E4F534E4150  # "DINOSNAP"
+SNAPSHOT_VERSION = 2
+DEFAULT_SLOTS = 4
+DEFAULT_DINO_CAPACITY = 1024
+ENEMY_CAPACITY = 16
+PUBLISH_FPS = 60
+# Intentos de copia de un snapshot antes de devolver el último bueno
+READ_ATTEMPTS = 100
+
+# Sprites que puede tener un snapshot (el índice es su id)
+SPRITE_NAMES = ("standing_dino", "walking_dino_1", "walking_dino_2",
+                "crouching_dino_1", "crouching_dino_2",
+                "cactus_type_1", "cactus_type_2", "cactus_type_3",
+                "cactus_type_4", "cactus_type_5", "cactus_type_6",
+                "bird_flying_1", "bird_flying_2")
+SPRITE_IDS = {name: sprite_id for sprite_id, name in enumerate(SPRITE_NAMES)}
+STANDING_DINO = SPRITE_IDS["standing_dino"]
+WALKING_DINO = SPRITE_IDS["walking_dino_1"]
+CROUCHING_DINO = SPRITE_IDS["crouching_dino_1"]
+
+# Desplazamiento del sprite del dinosaurio respecto a su caja (Dino.sprite_offset)
+DINO_SPRITE_OFFSET = (-4, -2)
+
+# Cabecera al principio de la memoria compartida
+HEADER_DTYPE = np.dtype([("magic", np.uint64), ("version", np.uint32), ("slots", np.uint32),
+                         ("dino_capacity", np.uint32), ("enemy_capacity", np.uint32),
+                         ("published", np.uint64), ("session", np.uint64),
+                         ("closed", np.uint32)], align=True)
+
+
+def snapshot_dtype(dino_capacity, enemy_capacity=ENEMY_CAPACITY):
+    """
+    Tipo de cada ranura del buffer.
+    
+    Args:
+        dino_capacity: dinosaurios vivos que caben en un snapshot
+        enemy_capacity: enemigos que caben en un snapshot
+    
+    Returns:
+        numpy.dtype estructurado
+    """
+    return np.dtype([
+        ("sequence", np.uint64),
+        # HUD
+        ("frame", np.int64),
+        ("generation", np.int64),
+        ("score", np.int64),
+        ("alive", np.int64),
+        ("last_gen_avg_score", np.float64),
+        ("last_gen_max_score", np.float64),
+        ("ground_x", np.int32),
+        # Dinosaurios vivos y enemigos: posición del sprite e id del sprite
+        ("dino_count", np.int32),
+        ("dino_x", np.int32, dino_capacity),
+        ("dino_y", np.int32, dino_capacity),
+        ("dino_sprite", np.uint8, dino_capacity),
+        ("enemy_count", np.int32),
+        ("enemy_x", np.int32, enemy_capacity),
+        ("enemy_y", np.int32, enemy_capacity),
+        ("enemy_sprite", np.uint8, enemy_capacity),
+        # Cerebro mostrado (el del primer dinosaurio vivo)
+        ("has_brain", np.bool_),
+        ("hidden_layer_weights", np.float64, (7, 7)),
+        ("output_layer_weights", np.float64, (2, 7)),
+        ("hidden_layer_bias", np.float64, 7),
+        ("output_layer_bias", np.float64, 2),
+        ("inputs", np.float64, 7),
+        ("hidden_outputs", np.float64, 7),
+        ("outputs", np.float64, 2),
+    ], align=True)
+
+
+def dino_sprite_ids(population, indices):
+    """
+    Id del sprite de cada dinosaurio indicado (igual que Dino.sprite).
+    
+    Args:
+        population: Population
+        indices: dinosaurios
+    
+    Returns:
+        numpy array uint8
+    """
+    frame = population.sprite_frame[indices]
+    sprite = np.where(population.obj_width[indices] == DINO_CROUCH_WIDTH,
+                      CROUCHING_DINO + frame, WALKING_DINO + frame)
+    sprite[population.jump_frame[indices] > 0] = STANDING_DINO
+    return sprite
+
+
+def attach_memory(name):
+    """
+    Abre una memoria compartida existente sin hacerse cargo de ella: al
+    cerrar el visor, el buffer sigue existiendo para el proceso que entrena.
+    
+    Args:
+        name: nombre de la memoria compartida
+    
+    Returns:
+        multiprocessing.shared_memory.SharedMemory
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13: se deja de seguir a mano
+        from multiprocessing import resource_tracker
+        memory = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
+
+
+class SnapshotPublisher:
+    """
+    Crea el buffer de snapshots y publica en él el estado de una simulación.
+    """
+    
+    def __init__(self, name=None, dino_capacity=DEFAULT_DINO_CAPACITY, slots=DEFAULT_SLOTS,
+                 fps=PUBLISH_FPS):
+        """
+        Args:
+            name: nombre de la memoria compartida (por defecto, uno aleatorio)
+            dino_capacity: dinosaurios vivos por snapshot (si hay más, se
+                publican los primeros)
+            slots: ranuras del buffer circular
+            fps: snapshots por segundo de reloj real como máximo (None =
+                uno por frame)
+        """
+        dtype = snapshot_dtype(dino_capacity)
+        self.memory = shared_memory.SharedMemory(name=name, create=True,
+                                                 size=HEADER_DTYPE.itemsize + slots * dtype.itemsize)
+        self.name = self.memory.name
+        self.header = np.ndarray((), HEADER_DTYPE, buffer=self.memory.buf)
+        self.snapshots = np.ndarray((slots,), dtype, buffer=self.memory.buf,
+                                    offset=HEADER_DTYPE.itemsize)
+        self.snapshots["sequence"] = 0
+        self.header["magic"] = SNAPSHOT_MAGIC
+        self.header["version"] = SNAPSHOT_VERSION
+        self.header["slots"] = slots
+        self.header["dino_capacity"] = dino_capacity
+        self.header["enemy_capacity"] = ENEMY_CAPACITY
+        self.header["published"] = 0
+        self.header["session"] = int.from_bytes(os.urandom(8), "little")
+        self.header["closed"] = 0
+        
+        self.dino_capacity = dino_capacity
+        self.interval = 1 / fps if fps else 0.0
+        self.last_publish = -float("inf")
+    
+    def maybe_publish(self, simulation):
+        """
+        Publica un snapshot si ya pasó el intervalo desde el anterior.
+        
+        Returns:
+            bool: True si se publicó
+        """
+        now = time.perf_counter()
+        if now - self.last_publish < self.interval:
+            return False
+        self.last_publish = now
+        self.publish(simulation)
+        return True
+    
+    def publish(self, simulation):
+        """
+        Escribe el estado actual de la simulación en la siguiente ranura.
+        
+        Args:
+            simulation: Simulation
+        """
+        published = int(self.header["published"])
+        snapshot = self.snapshots[published % len(self.snapshots)]
+        snapshot["sequence"] = 2 * published + 1
+        
+        population = simulation.population
+        snapshot["frame"] = simulation.ticks
+        snapshot["generation"] = simulation.generation
+        snapshot["score"] = simulation.score
+        snapshot["alive"] = simulation.dinos_alive
+        snapshot["last_gen_avg_score"] = simulation.last_gen_avg_score
+        snapshot["last_gen_max_score"] = simulation.last_gen_max_score
+        snapshot["ground_x"] = simulation.ground.x_pos
+        
+        alive = population.alive_indices()
+        shown = alive[:self.dino_capacity]
+        count = len(shown)
+        snapshot["dino_count"] = count
+        snapshot["dino_x"][:count] = population.x_pos[shown] + DINO_SPRITE_OFFSET[0]
+        snapshot["dino_y"][:count] = population.y_pos[shown] + DINO_SPRITE_OFFSET[1]
+        snapshot["dino_sprite"][:count] = dino_sprite_ids(population, shown)
+        
+        enemies = simulation.enemies[:ENEMY_CAPACITY]
+        snapshot["enemy_count"] = len(enemies)
+        for slot, enemy in enumerate(enemies):
+            snapshot["enemy_x"][slot] = enemy.x_pos + enemy.sprite_offset[0]
+            snapshot["enemy_y"][slot] = enemy.y_pos + enemy.sprite_offset[1]
+            snapshot["enemy_sprite"][slot] = SPRITE_IDS[enemy.sprite]
+        
+        snapshot["has_brain"] = len(alive) > 0
+        if len(alive) > 0:
+            brain = population.brain
+            row = alive[0]
+            snapshot["hidden_layer_weights"] = brain.hidden_layer_weights[row]
+            snapshot["output_layer_weights"] = brain.output_layer_weights[row]
+            snapshot["hidden_layer_bias"] = brain.hidden_layer_bias[row]
+            snapshot["output_layer_bias"] = brain.output_layer_bias[row]
+            snapshot["inputs"] = population.brain_inputs[row]
+            snapshot["hidden_outputs"] = brain.hidden_outputs[row]
+            snapshot["outputs"] = brain.outputs[row]
+        
+        snapshot["sequence"] = 2 * published + 2
+        self.header["published"] = published + 1
+    
+    def close(self):
+        """Cierra y elimina el buffer (los visores conectados vuelven a esperar uno nuevo)."""
+        self.header["closed"] = 1
+        del self.header, self.snapshots
+        self.memory.close()
+        self.memory.unlink()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SnapshotReader:
+    """
+    Lee el último snapshot completo de un buffer creado por SnapshotPublisher.
+    """
+    
+    def __init__(self, name):
+        """
+        Args:
+            name: nombre de la memoria compartida
+        
+        Raises:
+            FileNotFoundError: si no hay ningún buffer con ese nombre
+            ValueError: si la memoria no es un buffer de snapshots compatible
+        """
+        self.name = name
+        self.memory = attach_memory(name)
+        if self.memory.size < HEADER_DTYPE.itemsize:
+            self.memory.close()
+            raise ValueError(f"'{name}' no es un buffer de snapshots compatible")
+        self.header = np.ndarray((), HEADER_DTYPE, buffer=self.memory.buf)
+        if self.header["magic"] != SNAPSHOT_MAGIC or self.header["version"] != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"'{name}' no es un buffer de snapshots compatible")
+        self.session = int(self.header["session"])
+        self.last_snapshot = None
+        dtype = snapshot_dtype(int(self.header["dino_capacity"]), int(self.header["enemy_capacity"]))
+        self.snapshots = np.ndarray((int(self.header["slots"]),), dtype, buffer=self.memory.buf,
+                                    offset=HEADER_DTYPE.itemsize)
+    
+    def published(self):
+        """Número de snapshots publicados hasta ahora."""
+        return int(self.header["published"])
+    
+    def closed(self):
+        """True si el publicador cerró el buffer (el entrenamiento terminó)."""
+        return bool(self.header["closed"])
+    
+    def replaced(self):
+        """
+        Comprueba si el nombre ya no corresponde a este buffer: se eliminó
+        (p. ej. el entrenamiento murió sin cerrarlo) o lo creó otro
+        entrenamiento. Abre la memoria por nombre, así que conviene
+        llamarlo solo de vez en cuando.
+        
+        Returns:
+            bool: True si hay que volver a conectarse
+        """
+        try:
+            memory = attach_memory(self.name)
+        except FileNotFoundError:
+            return True
+        try:
+            if memory.size < HEADER_DTYPE.itemsize:
+                return True
+            header = np.ndarray((), HEADER_DTYPE, buffer=memory.buf)
+            session = int(header["session"])
+            del header
+            return session != self.session
+        finally:
+            memory.close()
+    
+    def latest(self):
+        """
+        Copia el último snapshot completo. Si el publicador reescribe la
+        ranura en cada intento, se rinde tras READ_ATTEMPTS intentos.
+        
+        Returns:
+            numpy.void con los campos de snapshot_dtype: el último snapshot
+            completo o, si no se pudo copiar, el último bueno leído antes
+            (None si todavía no hay ninguno)
+        """
+        for _ in range(READ_ATTEMPTS):
+            published = self.published()
+            if published == 0:
+                return self.last_snapshot
+            expected = 2 * published
+            slot = (published - 1) % len(self.snapshots)
+            if self.snapshots["sequence"][slot] != expected:
+                continue
+            copy = self.snapshots[slot:slot + 1].copy()[0]
+            # Si la ranura se reescribió durante la copia, se vuelve a intentar
+            if copy["sequence"] == expected and self.snapshots["sequence"][slot] == expected:
+                self.last_snapshot = copy
+                return copy
+        return self.last_snapshot
+    
+    def close(self):
+        """Se desconecta del buffer sin eliminarlo."""
+        del self.header
+        self.__dict__.pop("snapshots", None)
+        self.memory.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def draw_snapshot(screen, sprites, font, small_font, hud, snapshot):
+    """
+    Dibuja un snapshot igual que Simulation.draw.
+    
+    Args:
+        screen: superficie de pygame
+        sprites: diccionario de sprites
+        font: fuente grande
+        small_font: fuente pequeña
+        hud: Hud con los cachés de texto y del diagrama de la red
+        snapshot: numpy.void de SnapshotReader.latest
+    """
+    # Suelo
+    ground = sprites["ground"]
+    ground_x = int(snapshot["ground_x"])
+    screen.blit(ground, (ground_x, 515))
+    screen.blit(ground, (ground_x - 2400, 515))
+    
+    # Enemigos y dinosaurios vivos
+    for prefix in ("enemy", "dino"):
+        count = int(snapshot[prefix + "_count"])
+        positions = zip(snapshot[prefix + "_x"][:count].tolist(), snapshot[prefix + "_y"][:count].tolist())
+        for (x_pos, y_pos), sprite_id in zip(positions, snapshot[prefix + "_sprite"][:count].tolist()):
+            screen.blit(sprites[SPRITE_NAMES[sprite_id]], (x_pos, y_pos))
+    
+    # HUD (mismas posiciones que Simulation.draw_info)
+    hud.draw_text(screen, font, str(int(snapshot["score"])), (1200, 80))
+    hud.draw_text(screen, font, f"Generation: {int(snapshot['generation'])}", (80, 80))
+    hud.draw_text(screen, font, f"Average Score (last gen): {snapshot['last_gen_avg_score']:g}", (80, 120))
+    hud.draw_text(screen, font, f"Max Score (last gen): {snapshot['last_gen_max_score']:g}", (80, 160))
+    hud.draw_text(screen, font, f"Alive: {int(snapshot['alive'])}", (80, 200))
+    
+    if snapshot["has_brain"]:
+        brain = Brain.from_weights(snapshot["hidden_layer_weights"], snapshot["output_layer_weights"],
+                                   snapshot["hidden_layer_bias"], snapshot["output_layer_bias"])
+        brain.inputs = snapshot["inputs"]
+        brain.hidden_outputs = snapshot["hidden_outputs"]
+        brain.outputs = snapshot["outputs"]
+        hud.draw_network(screen, brain, small_font)
@@ -6,6 +6,8 @@ Archivo principal - Ejecutar este archivo para iniciar la simulación
 import pygame
 import sys
 import os
+import time
+import argparse
 
 
 scores=[]
@@ -17,6 +19,8 @@ if os.name == 'nt':  # Windows
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 from game.simulation import Simulation
+from game.checkpoint import save_checkpoint, load_checkpoint
+from utils.metrics_log import MetricsLog
 from utils.sprite_loader import initialize_sprites
 
 
@@ -25,8 +29,69 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 60
 BACKGROUND_COLOR = (247, 247, 247)
+CHECKPOINT_EVERY = 5
+RENDER_EVERY = 10
 simulation=None
 
+
+class RenderSchedule:
+    """
+    Decide en qué pasos de la simulación se dibuja:
+    - normal: en cada paso, limitado a FPS pasos por segundo
+    - turbo: la simulación avanza sin esperar al reloj y solo se dibuja cada
+      `every` pasos o, si se indica `fps`, como mucho `fps` veces por segundo
+    """
+    
+    def __init__(self, turbo=False, every=RENDER_EVERY, fps=None):
+        self.turbo = turbo
+        self.every = every
+        self.fps = fps
+        self.steps_since_draw = 0
+        self.last_draw = time.perf_counter()
+        self.steps_per_second = 0.0
+    
+    def should_draw(self, now):
+        """Cuenta un paso y dice si hay que dibujarlo."""
+        self.steps_since_draw += 1
+        if not self.turbo:
+            return True
+        if self.fps:
+            return now - self.last_draw >= 1 / self.fps
+        return self.steps_since_draw >= self.every
+    
+    def drawn(self, now):
+        """Registra que se ha dibujado y actualiza los pasos por segundo."""
+        if now > self.last_draw:
+            self.steps_per_second = self.steps_since_draw / (now - self.last_draw)
+        self.steps_since_draw = 0
+        self.last_draw = now
+
+
+def parse_args():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Dino Genetic AI")
+    parser.add_argument("--profile", default=None,
+                        help="exportar los tiempos por fase a este archivo (.json o .csv); "
+                             "la tecla P activa o pausa la medición")
+    parser.add_argument("--turbo", action="store_true",
+                        help="simular sin limite de FPS y dibujar solo algunos pasos "
+                             "(la tecla T lo activa o desactiva)")
+    parser.add_argument("--render-every", type=int, default=RENDER_EVERY,
+                        help="en modo turbo, dibujar uno de cada K pasos")
+    parser.add_argument("--render-fps", type=float, default=None,
+                        help="en modo turbo, dibujar a esta frecuencia de reloj real "
+                             "(tiene prioridad sobre --render-every)")
+    parser.add_argument("--metrics-log", default=None,
+                        help="archivo .csv o .jsonl donde añadir las estadísticas de cada generación; "
+                             "se visualiza en vivo con metrics_viewer.py en lugar de la gráfica final")
+    parser.add_argument("--checkpoint", default=None,
+                        help="archivo .npz donde guardar checkpoints de la población")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY,
+                        help="generaciones entre checkpoints")
+    parser.add_argument("--resume", default=None,
+                        help="checkpoint .npz desde el que reanudar la evolución")
+    return parser.parse_args()
+
 def grafica():
     # === 📊 Generar gráficas después de la simulación ===
     print(simulation.generation_data)
@@ -70,6 +135,8 @@ def grafica():
 def main():
     global simulation
     """Función principal del juego."""
+    args = parse_args()
+    
     # Inicializar Pygame
     pygame.init()
     
@@ -94,54 +161,86 @@ def main():
     font = pygame.font.Font(None, 36)
     small_font = pygame.font.Font(None, 20)
     
-    # Crear simulación
-    simulation = Simulation()
+    # Crear simulación (o reanudarla desde un checkpoint). Con el reloj
+    # simulado el juego no depende del tiempo real y el modo turbo no lo altera
+    if args.resume:
+        simulation = load_checkpoint(args.resume, fixed_timestep=True)
+        if simulation.courses > 1:
+            print(f"ERROR - {args.resume} entrena con {simulation.courses} recorridos a la vez; "
+                  "reanudalo con main_headless.py --resume")
+            pygame.quit()
+            sys.exit(1)
+        print(f"OK - Reanudando desde {args.resume} (generacion {simulation.generation})")
+    else:
+        simulation = Simulation(fixed_timestep=True)
+    simulation.profiler.enabled = args.profile is not None
+    if args.metrics_log:
+        simulation.metrics_log = MetricsLog(args.metrics_log)
+        simulation.keep_history = False
     print("OK - Simulacion iniciada")
     print(f"OK - Poblacion: {len(simulation.dinos)} dinosaurios")
     print("\nLa evolucion ha comenzado!\n")
     
-    # Control de tiempo para eventos periódicos
-    tenth_counter = 0
-    last_tenth_time = pygame.time.get_ticks()
+    schedule = RenderSchedule(args.turbo, args.render_every, args.render_fps)
     
     # Loop principal
     running = True
     while running and simulation.generation<=30:
-        # Manejar eventos
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+        now = time.perf_counter()
+        draw = schedule.should_draw(now)
+        
+        # Manejar eventos (en turbo, solo en los pasos que se dibujan)
+        if draw:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif event.key == pygame.K_p:
+                        simulation.profiler.enabled = not simulation.profiler.enabled
+                    elif event.key == pygame.K_t:
+                        schedule.turbo = not schedule.turbo
+        
+        # Actualizar simulación (incluye eventos periódicos)
+        generation = simulation.generation
+        simulation.step()
+        
+        # Checkpoint periódico al terminar una generación
+        if (args.checkpoint and simulation.generation != generation
+                and generation % args.checkpoint_every == 0):
+            save_checkpoint(simulation, args.checkpoint)
         
-        # Actualizar simulación
-        simulation.update()        
-        # Eventos periódicos (cada 50ms)
-        current_time = pygame.time.get_ticks()
-        if current_time - last_tenth_time > 50:
-            last_tenth_time = current_time
-            tenth_counter += 1
-            
-            # Cada 0.1 segundos
-            if tenth_counter % 2 == 0:
-                simulation.tenth_of_second()
-            
-            # Cada 0.25 segundos
-            if tenth_counter % 5 == 0:
-                simulation.quarter_of_second()
+        if not draw:
+            continue
         
         # Dibujar todo
         screen.fill(BACKGROUND_COLOR)
         simulation.draw(screen, sprites, font, small_font)
+        if schedule.turbo:
+            turbo_text = small_font.render(f"TURBO - {schedule.steps_per_second:.0f} pasos/s",
+                                           True, (0, 0, 0))
+            screen.blit(turbo_text, (80, 240))
         
         # Actualizar pantalla
         pygame.display.flip()
-        clock.tick(FPS)
+        schedule.drawn(now)
+        if not schedule.turbo:
+            clock.tick(FPS)
     
     # Limpiar y salir
     pygame.quit()
-    grafica()
+    if args.checkpoint:
+        save_checkpoint(simulation, args.checkpoint)
+        print(f"OK - Checkpoint guardado en {args.checkpoint}")
+    if args.profile:
+        simulation.profiler.save(args.profile)
+        print(f"OK - Tiempos por fase guardados en {args.profile}")
+    if simulation.metrics_log is not None:
+        simulation.metrics_log.close()
+        print(f"OK - Estadísticas en {args.metrics_log} (python metrics_viewer.py {args.metrics_log})")
+    else:
+        grafica()
     print("\nHasta luego!")
     print(f"Ultima generacion alcanzada: {simulation.generation}")
     print(f"Mejor score: {simulation.last_gen_max_score}")
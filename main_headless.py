@@ -0,0 +1,165 @@
+"""
+Juego del Dinosaurio de Chrome con IA Genetica
+Version headless: entrena sin ventana ni reloj real, con paso de tiempo fijo
+"""
+import os
+import sys
+import argparse
+
+# Evitar el mensaje de bienvenida de pygame en maquinas sin pantalla
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from game.simulation import Simulation, TOURNAMENT_SIZE
+from game.selection import SELECTION_METHODS
+from game.courses import FITNESS_AGGREGATES
+from game.backends import BACKENDS, DEFAULT_BACKEND, get_backend
+from game.evaluation import ParallelEvaluator, MemoizedEvaluator
+from game.checkpoint import save_checkpoint, load_checkpoint
+from game.snapshots import SnapshotPublisher, PUBLISH_FPS
+from neural_network.brain_cache import BrainCache
+from utils.metrics_log import MetricsLog
+
+
+# Constantes
+MAX_GENERATIONS = 30
+CHECKPOINT_EVERY = 5
+
+
+def fitness_arg(value):
+    """Convierte --fitness en "mean", "min" o un cuantil numerico."""
+    if value in FITNESS_AGGREGATES:
+        return value
+    try:
+        quantile = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba mean, min o un cuantil entre 0 y 1, no {value}")
+    if not 0 <= quantile <= 1:
+        raise argparse.ArgumentTypeError(f"el cuantil debe estar entre 0 y 1, no {value}")
+    return quantile
+
+
+def parse_args():
+    """Lee los argumentos de la linea de comandos."""
+    parser = argparse.ArgumentParser(description="Entrenamiento headless del dinosaurio")
+    parser.add_argument("--generations", type=int, default=MAX_GENERATIONS,
+                        help="numero de generaciones a simular")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semilla para obtener una ejecucion reproducible")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos para evaluar cada generacion en paralelo")
+    parser.add_argument("--selection", choices=sorted(SELECTION_METHODS), default="tournament",
+                        help="operador de seleccion de padres")
+    parser.add_argument("--tournament-size", type=int, default=TOURNAMENT_SIZE,
+                        help="participantes por torneo")
+    parser.add_argument("--fixed-course", action="store_true",
+                        help="jugar el mismo recorrido de obstaculos en todas las generaciones")
+    parser.add_argument("--courses", type=int, default=1,
+                        help="recorridos independientes que juega cada genoma a la vez")
+    parser.add_argument("--fitness", type=fitness_arg, default="mean",
+                        help="agregacion de los scores de varios recorridos: mean, min o "
+                             "un cuantil entre 0 y 1 (p. ej. 0.25)")
+    parser.add_argument("--backend", choices=["auto"] + sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help="backend del paso de la poblacion (auto = numba si esta instalado)")
+    parser.add_argument("--brain-cache", action="store_true",
+                        help="construir los cerebros con un cache por genoma (solo compensa "
+                             "con muchos genomas repetidos)")
+    parser.add_argument("--memoize", action="store_true",
+                        help="jugar cada genoma distinto una sola vez y reutilizar su score")
+    parser.add_argument("--profile", default=None,
+                        help="exportar los tiempos por fase a este archivo (.json o .csv)")
+    parser.add_argument("--metrics-log", default=None,
+                        help="archivo .csv o .jsonl donde anadir las estadisticas de cada "
+                             "generacion (sin guardarlas en memoria)")
+    parser.add_argument("--snapshots", default=None,
+                        help="publicar los frames en un buffer de memoria compartida con este "
+                             "nombre para verlos con snapshot_viewer.py")
+    parser.add_argument("--snapshot-fps", type=float, default=PUBLISH_FPS,
+                        help="snapshots por segundo como maximo")
+    parser.add_argument("--checkpoint", default=None,
+                        help="archivo .npz donde guardar checkpoints de la poblacion")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_EVERY,
+                        help="generaciones entre checkpoints")
+    parser.add_argument("--resume", default=None,
+                        help="checkpoint .npz desde el que reanudar el entrenamiento")
+    return parser.parse_args()
+
+
+def main():
+    """Funcion principal del entrenamiento headless."""
+    args = parse_args()
+    # Crear simulacion con reloj simulado (no necesita pygame.display)
+    if args.resume:
+        simulation = load_checkpoint(args.resume, fixed_timestep=True)
+        simulation.backend = get_backend(args.backend)
+        if args.brain_cache:
+            simulation.brain_cache = BrainCache()
+        print("Reanudando desde", args.resume, "en la generacion", simulation.generation)
+    else:
+        simulation = Simulation(fixed_timestep=True, seed=args.seed, fixed_course=args.fixed_course,
+                                selection=args.selection, tournament_size=args.tournament_size,
+                                courses=args.courses, fitness=args.fitness, backend=args.backend,
+                                brain_cache=args.brain_cache)
+    print("Simulacion headless iniciada")
+    print("Poblacion:", len(simulation.dinos), "dinosaurios")
+    print("Semilla:", simulation.seed)
+    print("Backend:", simulation.backend.name)
+    if simulation.courses > 1:
+        print("Recorridos por generacion:", simulation.courses, "- fitness:", simulation.fitness)
+    simulation.profiler.enabled = args.profile is not None
+    if args.metrics_log:
+        simulation.metrics_log = MetricsLog(args.metrics_log)
+        simulation.keep_history = False
+    if args.snapshots:
+        simulation.snapshots = SnapshotPublisher(args.snapshots, fps=args.snapshot_fps)
+        print("Snapshots en", simulation.snapshots.name, "- ver con: python snapshot_viewer.py",
+              simulation.snapshots.name)
+        if args.workers > 1 or simulation.courses > 1:
+            print("AVISO - Con --workers o --courses las generaciones no se juegan en este "
+                  "proceso y no se publican frames")
+    
+    # Loop principal: tan rapido como permita la CPU
+    evaluator = ParallelEvaluator(args.workers) if args.workers > 1 else None
+    if args.memoize:
+        evaluator = MemoizedEvaluator(evaluator)
+    try:
+        while simulation.generation <= args.generations:
+            if args.memoize:
+                evaluator.reset_stats()
+            simulation.run_generation(evaluator)
+            
+            # Informar la generacion terminada
+            stats = simulation.last_generation_stats
+            generation = stats["generation"]
+            print(f"Generacion {generation}: max={stats['max_score']:g} avg={stats['avg_score']:.2f} "
+                  f"min={stats['min_score']:g}")
+            cache = simulation.brain_cache
+            if cache is not None:
+                print(f"  cache de cerebros: {cache.hits} aciertos, {cache.misses} fallos")
+            if args.memoize:
+                print(f"  scores memorizados: {evaluator.hits} reutilizados, {evaluator.misses} jugados")
+            
+            if args.checkpoint and generation % args.checkpoint_every == 0:
+                save_checkpoint(simulation, args.checkpoint)
+    except KeyboardInterrupt:
+        print("\nInterrumpido por el usuario")
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+        if args.checkpoint:
+            save_checkpoint(simulation, args.checkpoint)
+            print("Checkpoint guardado en", args.checkpoint)
+        if simulation.metrics_log is not None:
+            simulation.metrics_log.close()
+        if simulation.snapshots is not None:
+            simulation.snapshots.close()
+        if args.profile:
+            simulation.profiler.save(args.profile)
+            print("Tiempos por fase guardados en", args.profile)
+    
+    print("\nUltima generacion alcanzada:", simulation.generation)
+    print("Mejor score:", simulation.last_gen_max_score)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -46,10 +46,6 @@ def main():
     print("Poblacion:", len(simulation.dinos), "dinosaurios")
     print("\nLa evolucion ha comenzado!\n")
     
-    # Control de tiempo para eventos periodicos
-    tenth_counter = 0
-    last_tenth_time = pygame.time.get_ticks()
-    
     # Loop principal
     running = True
     while running:
@@ -61,22 +57,8 @@ def main():
                 if event.key == pygame.K_ESCAPE:
                     running = False
         
-        # Actualizar simulacion
-        simulation.update()
-        
-        # Eventos periodicos (cada 50ms)
-        current_time = pygame.time.get_ticks()
-        if current_time - last_tenth_time > 50:
-            last_tenth_time = current_time
-            tenth_counter += 1
-            
-            # Cada 0.1 segundos
-            if tenth_counter % 2 == 0:
-                simulation.tenth_of_second()
-            
-            # Cada 0.25 segundos
-            if tenth_counter % 5 == 0:
-                simulation.quarter_of_second()
+        # Actualizar simulacion (incluye eventos periodicos)
+        simulation.step()
         
         # Dibujar todo
         screen.fill(BACKGROUND_COLOR)
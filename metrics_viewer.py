@@ -0,0 +1,84 @@
+"""
+Visor en vivo de las estadísticas por generación
+Lee el archivo de --metrics-log mientras el entrenamiento lo escribe y
+actualiza las gráficas con cada generación nueva.
+
+Uso:
+    python metrics_viewer.py metricas.csv
+"""
+import sys
+import argparse
+from utils.metrics_log import MetricsTail
+
+
+# Constantes
+REFRESH_SECONDS = 1.0
+
+
+def parse_args():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Visor en vivo de las estadísticas por generación")
+    parser.add_argument("path", help="archivo .csv o .jsonl escrito con --metrics-log")
+    parser.add_argument("--refresh", type=float, default=REFRESH_SECONDS,
+                        help="segundos entre lecturas del archivo")
+    parser.add_argument("--once", action="store_true",
+                        help="dibujar lo que hay en el archivo y no seguir leyendo")
+    return parser.parse_args()
+
+
+def main():
+    """Función principal del visor."""
+    args = parse_args()
+    import matplotlib.pyplot as plt
+    
+    tail = MetricsTail(args.path)
+    series = {column: [] for column in ("generation", "max_score", "avg_score", "min_score",
+                                         "std", "evaluations_per_second")}
+    
+    figure, (scores_axis, diversity_axis, speed_axis) = plt.subplots(3, 1, figsize=(10, 9), sharex=True)
+    figure.canvas.manager.set_window_title(f"Dino Genetic AI - {args.path}")
+    max_line, = scores_axis.plot([], [], 'r-', label='Score Máximo', linewidth=2)
+    avg_line, = scores_axis.plot([], [], 'b-', label='Score Promedio', linewidth=2)
+    min_line, = scores_axis.plot([], [], 'y-', label='Score Mínimo', linewidth=1.5, alpha=0.6)
+    std_line, = diversity_axis.plot([], [], color='purple', linewidth=2)
+    speed_line, = speed_axis.plot([], [], color='green', linewidth=1.5)
+    
+    scores_axis.set_title("Evolución del Score por Generación")
+    scores_axis.set_ylabel("Score")
+    scores_axis.legend(loc="upper left")
+    diversity_axis.set_ylabel("Desviación estándar")
+    speed_axis.set_ylabel("Evaluaciones/s")
+    speed_axis.set_xlabel("Generación")
+    for axis in (scores_axis, diversity_axis, speed_axis):
+        axis.grid(True, linestyle='--', alpha=0.6)
+    figure.tight_layout()
+    
+    lines = [(max_line, "max_score"), (avg_line, "avg_score"), (min_line, "min_score"),
+             (std_line, "std"), (speed_line, "evaluations_per_second")]
+    
+    plt.ion()
+    plt.show()
+    while plt.fignum_exists(figure.number):
+        # Solo se leen y añaden las generaciones nuevas
+        records = tail.poll()
+        if records:
+            for record in records:
+                for column, values in series.items():
+                    values.append(record[column])
+            for line, column in lines:
+                line.set_data(series["generation"], series[column])
+            for axis in (scores_axis, diversity_axis, speed_axis):
+                axis.relim()
+                axis.autoscale_view()
+            figure.canvas.draw_idle()
+        
+        if args.once:
+            plt.ioff()
+            plt.show()
+            break
+        plt.pause(args.refresh)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
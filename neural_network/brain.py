@@ -3,7 +3,32 @@ Red neuronal (cerebro) para controlar el comportamiento del dinosaurio.
 """
 import pygame
 import numpy as np
-from utils.linear_algebra import matrix_vector_multiplication, zeroes_matrix
+from utils.linear_algebra import (
+    vectorized_matrix_vector_multiplication, batched_matrix_vector_multiplication,
+    add_bias_relu, zeroes_matrix
+)
+
+
+def scatter_genes(genes, hidden_layer_weights, output_layer_weights):
+    """
+    Escribe los pesos de los genes en las matrices de pesos de cada red.
+    Los genes se aplican en orden: si dos genes apuntan a la misma conexión,
+    gana el último.
+    
+    Args:
+        genes: numpy array (N, 16) con GENE_DTYPE
+        hidden_layer_weights: numpy array (N, 7, 7) donde escribir
+        output_layer_weights: numpy array (N, 2, 7) donde escribir
+    """
+    rows = np.arange(len(genes))
+    for position in range(genes.shape[1]):
+        gene = genes[:, position]
+        hidden = gene["source_hidden_layer"]
+        output = ~hidden
+        hidden_layer_weights[rows[hidden], gene["id_target_neuron"][hidden],
+                             gene["id_source_neuron"][hidden]] = gene["weight"][hidden]
+        output_layer_weights[rows[output], gene["id_target_neuron"][output],
+                             gene["id_source_neuron"][output]] = gene["weight"][output]
 
 
 class Brain:
@@ -22,16 +47,31 @@ class Brain:
         self.hidden_layer_weights = zeroes_matrix(7, 7)
         self.output_layer_weights = zeroes_matrix(2, 7)
         
-        for gen in genome.genes:
-            if gen.source_hidden_layer:
-                self.hidden_layer_weights[gen.id_target_neuron][gen.id_source_neuron] = gen.weight
-            else:
-                self.output_layer_weights[gen.id_target_neuron][gen.id_source_neuron] = gen.weight
+        scatter_genes(genome.genes[None], self.hidden_layer_weights[None], self.output_layer_weights[None])
         
         self.hidden_layer_bias = genome.hidden_layer_bias
         self.output_layer_bias = genome.output_layer_bias
         self.hidden_outputs = np.zeros(7)
     
+    @classmethod
+    def from_weights(cls, hidden_layer_weights, output_layer_weights,
+                     hidden_layer_bias, output_layer_bias):
+        """
+        Crea un cerebro a partir de pesos ya construidos (sin genoma).
+        
+        Returns:
+            Brain: cerebro que comparte los arrays recibidos
+        """
+        brain = cls.__new__(cls)
+        brain.inputs = np.zeros(7)
+        brain.outputs = np.array([1, 0])
+        brain.hidden_layer_weights = hidden_layer_weights
+        brain.output_layer_weights = output_layer_weights
+        brain.hidden_layer_bias = hidden_layer_bias
+        brain.output_layer_bias = output_layer_bias
+        brain.hidden_outputs = np.zeros(7)
+        return brain
+    
     def relu(self, x):
         """Función de activación ReLU."""
         return max(0, x)
@@ -47,16 +87,12 @@ class Brain:
         self.inputs = np.array(input_layer_values)
         
         # Capa oculta
-        self.hidden_outputs = matrix_vector_multiplication(self.hidden_layer_weights, input_layer_values)
-        for i in range(len(self.hidden_outputs)):
-            self.hidden_outputs[i] += self.hidden_layer_bias[i]
-            self.hidden_outputs[i] = self.relu(self.hidden_outputs[i])
+        self.hidden_outputs = vectorized_matrix_vector_multiplication(self.hidden_layer_weights, self.inputs)
+        add_bias_relu(self.hidden_outputs, self.hidden_layer_bias, out=self.hidden_outputs)
         
         # Capa de salida
-        self.outputs = matrix_vector_multiplication(self.output_layer_weights, self.hidden_outputs)
-        for i in range(len(self.outputs)):
-            self.outputs[i] += self.output_layer_bias[i]
-            self.outputs[i] = self.relu(self.outputs[i])
+        self.outputs = vectorized_matrix_vector_multiplication(self.output_layer_weights, self.hidden_outputs)
+        add_bias_relu(self.outputs, self.output_layer_bias, out=self.outputs)
     
     def set_neural_connection_stroke(self, weight):
         """
@@ -78,10 +114,24 @@ class Brain:
         
         return color, width
     
-    def draw(self, screen, font):
+    def draw(self, screen, font, text_cache=None):
         """
         Dibuja la visualización de la red neuronal.
         
+        Args:
+            screen: superficie de pygame
+            font: fuente para el texto
+            text_cache: TextCache opcional para reutilizar los textos renderizados
+        """
+        self.draw_static(screen, font)
+        self.draw_activations(screen, font, text_cache)
+    
+    def draw_static(self, screen, font):
+        """
+        Dibuja la parte de la red que solo depende de los pesos: etiquetas,
+        conexiones y capa de entrada. Se puede dibujar una vez y reutilizar
+        mientras no cambien los pesos.
+        
         Args:
             screen: superficie de pygame
             font: fuente para el texto
@@ -120,7 +170,18 @@ class Brain:
             # Círculos de capa de entrada
             pygame.draw.circle(screen, (255, 255, 255), (700, 64 + i * 40), 16)
             pygame.draw.circle(screen, (83, 83, 83), (700, 64 + i * 40), 16, 1)
-            
+    
+    def draw_activations(self, screen, font, text_cache=None):
+        """
+        Dibuja la parte de la red que cambia en cada frame: valores de
+        entrada y neuronas ocultas y de salida activas.
+        
+        Args:
+            screen: superficie de pygame
+            font: fuente para el texto
+            text_cache: TextCache opcional para reutilizar los textos renderizados
+        """
+        for i in range(7):
             # Círculos de capa oculta
             if self.hidden_outputs[i] == 0:
                 fill_color = (255, 255, 255)
@@ -130,9 +191,11 @@ class Brain:
             pygame.draw.circle(screen, (0, 0, 0), (800, 64 + i * 40), 16, 1)
             
             # Texto de valores de entrada
-            small_font = pygame.font.Font(None, 20)
             input_text = f"{self.inputs[i]:.3f}"
-            text_surface = small_font.render(input_text, True, (0, 0, 0))
+            if text_cache is None:
+                text_surface = font.render(input_text, True, (0, 0, 0))
+            else:
+                text_surface = text_cache.render(font, input_text)
             screen.blit(text_surface, (688, 58 + i * 40))
         
         # Círculos de salida
@@ -143,8 +206,167 @@ class Brain:
                 fill_color = (170, 170, 170)
             pygame.draw.circle(screen, fill_color, (900, 165 + j * 40), 16)
             pygame.draw.circle(screen, (0, 0, 0), (900, 165 + j * 40), 16, 1)
+    
     def get_weights(self):
         return {
             "input_hidden": self.inputs,
             "hidden_output": self.hidden_layer_weights
-        }
\ No newline at end of file
+        }
+
+
+class PopulationBrain:
+    """
+    Cerebros de toda la población apilados en tensores:
+    - pesos ocultos (N, 7, 7) y de salida (N, 2, 7)
+    - bias ocultos (N, 7) y de salida (N, 2)
+    Evalúa a todos los dinosaurios vivos en una sola llamada.
+    """
+    
+    # Arrays por dinosaurio que se copian al seleccionar o concatenar
+    FIELDS = ("hidden_layer_weights", "output_layer_weights", "hidden_layer_bias",
+              "output_layer_bias", "hidden_outputs", "outputs")
+    
+    def __init__(self, size):
+        self.size = size
+        self.hidden_layer_weights = np.zeros((size, 7, 7))
+        self.output_layer_weights = np.zeros((size, 2, 7))
+        self.hidden_layer_bias = np.zeros((size, 7))
+        self.output_layer_bias = np.zeros((size, 2))
+        self.hidden_outputs = np.zeros((size, 7))
+        self.outputs = np.tile([1.0, 0.0], (size, 1))
+    
+    @classmethod
+    def from_genomes(cls, genomes, cache=None):
+        """
+        Construye los cerebros de un lote de genomas.
+        
+        Args:
+            genomes: GenomeBatch
+            cache: BrainCache opcional para reutilizar los pesos de genomas
+                ya construidos
+        
+        Returns:
+            PopulationBrain: cerebros apilados
+        """
+        population_brain = cls(len(genomes))
+        if cache is None:
+            scatter_genes(genomes.genes, population_brain.hidden_layer_weights,
+                          population_brain.output_layer_weights)
+        else:
+            cache.build(genomes.genes, population_brain.hidden_layer_weights,
+                        population_brain.output_layer_weights)
+        population_brain.hidden_layer_bias[:] = genomes.hidden_layer_bias
+        population_brain.output_layer_bias[:] = genomes.output_layer_bias
+        return population_brain
+    
+    def load_genome(self, index, genome):
+        """
+        Reconstruye los pesos de un dinosaurio desde su genoma.
+        
+        Args:
+            index: fila del dinosaurio
+            genome: Genome
+        """
+        self.hidden_layer_weights[index] = 0
+        self.output_layer_weights[index] = 0
+        scatter_genes(genome.genes[None], self.hidden_layer_weights[index, None],
+                      self.output_layer_weights[index, None])
+        self.hidden_layer_bias[index] = genome.hidden_layer_bias
+        self.output_layer_bias[index] = genome.output_layer_bias
+    
+    def select(self, indices):
+        """
+        Crea un PopulationBrain copiando las filas indicadas.
+        
+        Args:
+            indices: índices de los dinosaurios a copiar
+        
+        Returns:
+            PopulationBrain: cerebros copiados
+        """
+        selected = PopulationBrain.__new__(PopulationBrain)
+        selected.size = len(indices)
+        for field in self.FIELDS:
+            setattr(selected, field, getattr(self, field)[indices])
+        return selected
+    
+    @classmethod
+    def concatenate(cls, population_brains):
+        """
+        Une varios PopulationBrain en uno solo, en el orden dado.
+        
+        Returns:
+            PopulationBrain: cerebros concatenados
+        """
+        joined = cls.__new__(cls)
+        joined.size = sum(brain.size for brain in population_brains)
+        for field in cls.FIELDS:
+            setattr(joined, field, np.concatenate([getattr(b, field) for b in population_brains]))
+        return joined
+    
+    def feed_forward(self, input_layer_values, indices):
+        """
+        Propaga las entradas de varios dinosaurios a través de sus redes.
+        Produce exactamente las mismas salidas que Brain.feed_forward.
+        
+        Args:
+            input_layer_values: array (n, 7) de valores normalizados
+            indices: filas de los dinosaurios a evaluar
+        
+        Returns:
+            numpy array (n, 2) con las salidas (saltar, agacharse)
+        """
+        # Capa oculta
+        hidden_outputs = batched_matrix_vector_multiplication(
+            self.hidden_layer_weights[indices], input_layer_values)
+        add_bias_relu(hidden_outputs, self.hidden_layer_bias[indices], out=hidden_outputs)
+        
+        # Capa de salida
+        outputs = batched_matrix_vector_multiplication(
+            self.output_layer_weights[indices], hidden_outputs)
+        add_bias_relu(outputs, self.output_layer_bias[indices], out=outputs)
+        
+        self.hidden_outputs[indices] = hidden_outputs
+        self.outputs[indices] = outputs
+        return outputs
+    
+    def feed_forward_copies(self, input_layer_values):
+        """
+        Propaga las entradas de varias copias de la población (una por
+        recorrido) usando cada matriz de pesos para todas sus copias, sin
+        replicar los pesos. Las salidas son idénticas a las de feed_forward;
+        las activaciones no se guardan.
+        
+        Args:
+            input_layer_values: array (copias, N, 7) de valores normalizados
+        
+        Returns:
+            numpy array (copias, N, 2) con las salidas (saltar, agacharse)
+        """
+        hidden_outputs = batched_matrix_vector_multiplication(
+            self.hidden_layer_weights, input_layer_values)
+        add_bias_relu(hidden_outputs, self.hidden_layer_bias, out=hidden_outputs)
+        
+        outputs = batched_matrix_vector_multiplication(
+            self.output_layer_weights, hidden_outputs)
+        return add_bias_relu(outputs, self.output_layer_bias, out=outputs)
+    
+    def brain(self, index, inputs=None):
+        """
+        Devuelve un Brain con los pesos y activaciones de un dinosaurio
+        (para dibujar e inspeccionar).
+        
+        Args:
+            index: fila del dinosaurio
+            inputs: entradas actuales de su red (opcional)
+        
+        Returns:
+            Brain: vista sobre los pesos de esa fila
+        """
+        brain = Brain.from_weights(self.hidden_layer_weights[index], self.output_layer_weights[index],
+                                   self.hidden_layer_bias[index], self.output_layer_bias[index])
+        if inputs is not None:
+            brain.inputs = np.array(inputs)
+        brain.hidden_outputs = self.hidden_outputs[index].copy()
+        brain.outputs = self.outputs[index].copy()
+        return brain
\ No newline at end of file
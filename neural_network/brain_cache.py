@@ -0,0 +1,92 @@
+"""
+Caché de cerebros construidos, indexado por el contenido del genoma.
+"""
+from collections import OrderedDict
+import numpy as np
+from neural_network.brain import scatter_genes
+
+
+# Cerebros guardados como máximo (unos 500 bytes de pesos cada uno)
+DEFAULT_CAPACITY = 4096
+
+
+class BrainCache:
+    """
+    Guarda las matrices de pesos ya construidas de cada genoma, con
+    expulsión LRU (se descarta el menos usado recientemente).
+    Genomas idénticos comparten unas mismas matrices inmutables, así que
+    solo se construyen una vez. Cuenta aciertos y fallos para medir el
+    trabajo ahorrado.
+    """
+    
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        """
+        Args:
+            capacity: número máximo de cerebros guardados
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def reset_stats(self):
+        """Pone a cero los contadores de aciertos y fallos."""
+        self.hits = 0
+        self.misses = 0
+    
+    def build(self, genes, hidden_layer_weights, output_layer_weights):
+        """
+        Escribe los pesos de cada genoma, reutilizando los guardados.
+        Los genomas que faltan (o se repiten dentro del lote) se construyen
+        una sola vez y se guardan.
+        
+        Args:
+            genes: numpy array (N, 16) con GENE_DTYPE
+            hidden_layer_weights: numpy array (N, 7, 7) donde escribir
+            output_layer_weights: numpy array (N, 2, 7) donde escribir
+        """
+        # Clave de cada genoma: los bytes de sus genes (una sola vista, sin copiar fila a fila)
+        genes = np.ascontiguousarray(genes)
+        keys = genes.view(np.dtype((np.void, genes.dtype.itemsize * genes.shape[1]))).ravel().tolist()
+        found_rows, found = [], []
+        missing_rows, missing_keys = [], {}
+        for row, key in enumerate(keys):
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                found_rows.append(row)
+                found.append(entry)
+                self.hits += 1
+            elif key in missing_keys:
+                # Repetido dentro del lote: se construye una vez
+                self.hits += 1
+            else:
+                missing_keys[key] = len(missing_rows)
+                missing_rows.append(row)
+                self.misses += 1
+        
+        if found_rows:
+            hidden, output = zip(*found)
+            hidden_layer_weights[found_rows] = hidden
+            output_layer_weights[found_rows] = output
+        
+        if missing_rows:
+            hidden = np.zeros((len(missing_rows), 7, 7))
+            output = np.zeros((len(missing_rows), 2, 7))
+            scatter_genes(genes[missing_rows], hidden, output)
+            hidden.flags.writeable = False
+            output.flags.writeable = False
+            for key, position in missing_keys.items():
+                self.entries[key] = (hidden[position], output[position])
+            
+            # Filas repetidas: todas las que comparten genoma con una construida
+            rows = [missing_keys[key] for key in keys if key in missing_keys]
+            built_rows = [row for row, key in enumerate(keys) if key in missing_keys]
+            hidden_layer_weights[built_rows] = hidden[rows]
+            output_layer_weights[built_rows] = output[rows]
+        
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
@@ -1,23 +1,46 @@
 """
-Clases Gen y Genome para el algoritmo genético.
+Genomas del algoritmo genético guardados en arrays de NumPy.
+
+Cada gen es un registro estructurado (capa de origen, neurona de origen,
+neurona destino, peso). Un Genome es un dinosaurio y un GenomeBatch agrupa
+los genomas de toda una población, con mutación y crossover vectorizados.
 """
-import random
+import numpy as np
 from utils.linear_algebra import random_vector
 
 
-class Gen:
-    """Representa una conexión neuronal con su peso."""
+# Registro de un gen: una conexión neuronal con su peso
+GENE_DTYPE = np.dtype([
+    ("source_hidden_layer", np.bool_),
+    ("id_source_neuron", np.int8),
+    ("id_target_neuron", np.int8),
+    ("weight", np.float64),
+])
+GENOME_LENGTH = 16
+HIDDEN_NEURONS = 7
+OUTPUT_NEURONS = 2
+MAX_GENES_CHANGED = 4
+
+
+def random_genes(shape, rng):
+    """
+    Crea genes aleatorios.
     
-    def __init__(self):
-        self.source_hidden_layer = random.random() < 0.5
-        self.id_source_neuron = random.randint(0, 6)
-        
-        if self.source_hidden_layer:
-            self.id_target_neuron = random.randint(0, 6)
-        else:
-            self.id_target_neuron = random.randint(0, 1)
-        
-        self.weight = random.uniform(-1, 1)
+    Args:
+        shape: forma del array de genes
+        rng: numpy.random.Generator
+    
+    Returns:
+        numpy array estructurado con GENE_DTYPE
+    """
+    genes = np.empty(shape, dtype=GENE_DTYPE)
+    genes["source_hidden_layer"] = rng.random(shape) < 0.5
+    genes["id_source_neuron"] = rng.integers(0, 7, shape)
+    genes["id_target_neuron"] = np.where(genes["source_hidden_layer"],
+                                         rng.integers(0, HIDDEN_NEURONS, shape),
+                                         rng.integers(0, OUTPUT_NEURONS, shape))
+    genes["weight"] = rng.uniform(-1, 1, shape)
+    return genes
 
 
 class Genome:
@@ -26,53 +49,200 @@ class Genome:
     Contiene todos los genes (pesos de las conexiones neuronales) y los bias.
     """
     
-    def __init__(self):
-        self.length = 16
-        self.genes = [Gen() for _ in range(self.length)]
-        self.hidden_layer_bias = random_vector(7)
-        self.output_layer_bias = random_vector(2)
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng: numpy.random.Generator (por defecto, uno nuevo sin semilla)
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        self.length = GENOME_LENGTH
+        self.genes = random_genes(GENOME_LENGTH, rng)
+        self.hidden_layer_bias = random_vector(HIDDEN_NEURONS, rng)
+        self.output_layer_bias = random_vector(OUTPUT_NEURONS, rng)
+    
+    @classmethod
+    def from_arrays(cls, genes, hidden_layer_bias, output_layer_bias):
+        """
+        Crea un genoma sobre arrays existentes (sin copiarlos).
+        
+        Returns:
+            Genome: genoma que comparte los arrays recibidos
+        """
+        genome = cls.__new__(cls)
+        genome.length = GENOME_LENGTH
+        genome.genes = genes
+        genome.hidden_layer_bias = hidden_layer_bias
+        genome.output_layer_bias = output_layer_bias
+        return genome
     
     def copy(self):
         """Crea una copia profunda del genoma."""
-        copied_genome = Genome()
+        return Genome.from_arrays(self.genes.copy(), self.hidden_layer_bias.copy(),
+                                  self.output_layer_bias.copy())
+    
+    def mutate(self, rng=None):
+        """
+        Crea un genoma mutado basado en este genoma.
+        Cambia entre 1 y 4 genes aleatorios.
         
-        # Copiar genes
-        for i in range(self.length):
-            copied_genome.genes[i] = self.genes[i]
+        Args:
+            rng: numpy.random.Generator (por defecto, uno nuevo sin semilla)
+        """
+        return GenomeBatch.from_genomes([self]).mutate([0], rng)[0]
+    
+    def crossover(self, another_genome, rng=None):
+        """
+        Crea un genoma hijo combinando este genoma con otro.
+        Toma entre 1 y 4 genes del otro genoma.
         
-        # Copiar bias
-        for i in range(7):
-            copied_genome.hidden_layer_bias[i] = self.hidden_layer_bias[i]
+        Args:
+            another_genome: Genome del otro padre
+            rng: numpy.random.Generator (por defecto, uno nuevo sin semilla)
+        """
+        return GenomeBatch.from_genomes([self, another_genome]).crossover([0], [1], rng)[0]
+
+
+class GenomeBatch:
+    """
+    Genomas de una población completa en arrays contiguos:
+    - genes (N, 16) con GENE_DTYPE
+    - bias ocultos (N, 7) y de salida (N, 2)
+    Mutación y crossover generan todos los hijos de una vez.
+    """
+    
+    def __init__(self, genes, hidden_layer_bias, output_layer_bias):
+        """
+        Args:
+            genes: numpy array (N, 16) con GENE_DTYPE
+            hidden_layer_bias: numpy array (N, 7)
+            output_layer_bias: numpy array (N, 2)
+        """
+        self.genes = genes
+        self.hidden_layer_bias = hidden_layer_bias
+        self.output_layer_bias = output_layer_bias
+    
+    @classmethod
+    def random(cls, size, rng=None):
+        """
+        Crea genomas aleatorios.
         
-        for i in range(2):
-            copied_genome.output_layer_bias[i] = self.output_layer_bias[i]
+        Args:
+            size: número de genomas
+            rng: numpy.random.Generator (por defecto, uno nuevo sin semilla)
         
-        return copied_genome
+        Returns:
+            GenomeBatch
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        return cls(random_genes((size, GENOME_LENGTH), rng),
+                   random_vector((size, HIDDEN_NEURONS), rng),
+                   random_vector((size, OUTPUT_NEURONS), rng))
     
-    def mutate(self):
+    @classmethod
+    def from_genomes(cls, genomes):
         """
-        Crea un genoma mutado basado en este genoma.
-        Cambia entre 1 y 4 genes aleatorios.
+        Apila una lista de Genome.
+        
+        Returns:
+            GenomeBatch
+        """
+        return cls(np.array([genome.genes for genome in genomes], dtype=GENE_DTYPE).reshape(-1, GENOME_LENGTH),
+                   np.array([genome.hidden_layer_bias for genome in genomes], dtype=float).reshape(-1, HIDDEN_NEURONS),
+                   np.array([genome.output_layer_bias for genome in genomes], dtype=float).reshape(-1, OUTPUT_NEURONS))
+    
+    @classmethod
+    def concatenate(cls, batches):
+        """
+        Une varios lotes de genomas, en el orden dado.
+        
+        Returns:
+            GenomeBatch
+        """
+        return cls(np.concatenate([batch.genes for batch in batches]),
+                   np.concatenate([batch.hidden_layer_bias for batch in batches]),
+                   np.concatenate([batch.output_layer_bias for batch in batches]))
+    
+    def __len__(self):
+        return len(self.genes)
+    
+    def __getitem__(self, index):
+        """Genome que comparte los arrays de la fila indicada."""
+        return Genome.from_arrays(self.genes[index], self.hidden_layer_bias[index],
+                                  self.output_layer_bias[index])
+    
+    def __setitem__(self, index, genome):
+        self.genes[index] = genome.genes
+        self.hidden_layer_bias[index] = genome.hidden_layer_bias
+        self.output_layer_bias[index] = genome.output_layer_bias
+    
+    def select(self, indices):
         """
-        mutated_genome = self.copy()
-        amount_of_mutations = random.randint(1, 4)
+        Copia los genomas de las filas indicadas.
         
-        for _ in range(amount_of_mutations):
-            index = random.randint(0, self.length - 1)
-            mutated_genome.genes[index] = Gen()
+        Args:
+            indices: filas a copiar (pueden repetirse)
         
-        return mutated_genome
+        Returns:
+            GenomeBatch
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return GenomeBatch(self.genes[indices], self.hidden_layer_bias[indices],
+                           self.output_layer_bias[indices])
     
-    def crossover(self, another_genome):
+    def mutate(self, parents, rng=None):
         """
-        Crea un genoma hijo combinando este genoma con otro.
-        Toma entre 1 y 4 genes del otro genoma.
+        Crea un hijo mutado por cada padre: copia su genoma y cambia entre
+        1 y 4 genes aleatorios por genes nuevos.
+        
+        Args:
+            parents: filas de los padres (una por hijo, pueden repetirse)
+            rng: numpy.random.Generator (por defecto, uno nuevo sin semilla)
+        
+        Returns:
+            GenomeBatch con los hijos
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        children = self.select(parents)
+        amount_of_mutations, positions = self._changes(len(children), rng)
+        new_genes = random_genes((len(children), MAX_GENES_CHANGED), rng)
+        
+        # Los cambios se aplican en orden, como si se hicieran uno a uno
+        for change in range(MAX_GENES_CHANGED):
+            rows = np.flatnonzero(amount_of_mutations > change)
+            children.genes[rows, positions[rows, change]] = new_genes[rows, change]
+        return children
+    
+    def crossover(self, fathers, mothers, rng=None):
         """
-        crossed_genome = self.copy()
-        amount_of_crossovers = random.randint(1, 4)
+        Crea un hijo por cada pareja: copia el genoma del padre y toma entre
+        1 y 4 genes del genoma de la madre (en la misma posición).
         
-        for _ in range(amount_of_crossovers):
-            index = random.randint(0, self.length - 1)
-            crossed_genome.genes[index] = another_genome.genes[index]
+        Args:
+            fathers: filas de los padres
+            mothers: filas de las madres
+            rng: numpy.random.Generator (por defecto, uno nuevo sin semilla)
         
-        return crossed_genome
\ No newline at end of file
+        Returns:
+            GenomeBatch con los hijos
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        mothers = np.asarray(mothers, dtype=np.intp)
+        children = self.select(fathers)
+        amount_of_crossovers, positions = self._changes(len(children), rng)
+        
+        for change in range(MAX_GENES_CHANGED):
+            rows = np.flatnonzero(amount_of_crossovers > change)
+            columns = positions[rows, change]
+            children.genes[rows, columns] = self.genes[mothers[rows], columns]
+        return children
+    
+    @staticmethod
+    def _changes(size, rng):
+        """Sortea cuántos genes cambia cada hijo (1 a 4) y en qué posiciones."""
+        amounts = rng.integers(1, MAX_GENES_CHANGED + 1, size)
+        positions = rng.integers(0, GENOME_LENGTH, (size, MAX_GENES_CHANGED))
+        return amounts, positions
@@ -0,0 +1,114 @@
+"""
+Visor de un entrenamiento en curso
+Se conecta al buffer de snapshots que publica main_headless.py --snapshots
+y dibuja el último frame a su propio ritmo, sin frenar el entrenamiento.
+Se puede abrir y cerrar en cualquier momento; si el entrenamiento todavía
+no empezó, espera a que aparezca el buffer, y cuando termina (o se
+reinicia) vuelve a esperar el del siguiente.
+
+Uso:
+    python main_headless.py --snapshots dino --generations 1000
+    python snapshot_viewer.py dino
+"""
+import sys
+import time
+import argparse
+import pygame
+from game.hud import Hud
+from game.snapshots import SnapshotReader, draw_snapshot
+from utils.sprite_loader import initialize_sprites
+
+
+# Constantes
+SCREEN_WIDTH = 1280
+SCREEN_HEIGHT = 720
+FPS = 60
+BACKGROUND_COLOR = (247, 247, 247)
+RETRY_SECONDS = 1.0
+
+
+def parse_args():
+    """Lee los argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Visor de un entrenamiento en curso")
+    parser.add_argument("name", help="nombre del buffer de snapshots (--snapshots del entrenamiento)")
+    parser.add_argument("--fps", type=int, default=FPS, help="frames por segundo del visor")
+    return parser.parse_args()
+
+
+def connect(name):
+    """
+    Intenta conectarse al buffer de snapshots.
+    
+    Returns:
+        SnapshotReader, o None si el buffer todavía no existe (o ya se cerró)
+    """
+    try:
+        reader = SnapshotReader(name)
+    except FileNotFoundError:
+        return None
+    if reader.closed():
+        reader.close()
+        return None
+    return reader
+
+
+def main():
+    """Función principal del visor."""
+    args = parse_args()
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"Dino Genetic AI - {args.name}")
+    clock = pygame.time.Clock()
+    sprites = initialize_sprites()
+    font = pygame.font.Font(None, 36)
+    small_font = pygame.font.Font(None, 20)
+    hud = Hud()
+    
+    reader = None
+    last_attempt = -RETRY_SECONDS
+    last_published = 0
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+        
+        # Conectarse (o reintentar) hasta que el entrenamiento publique el
+        # buffer; si terminó o se reinició, se vuelve a esperar
+        now = time.perf_counter()
+        if reader is not None and (reader.closed() or
+                                   (now - last_attempt >= RETRY_SECONDS and reader.replaced())):
+            reader.close()
+            reader = None
+            last_published = 0
+        if now - last_attempt >= RETRY_SECONDS:
+            last_attempt = now
+            if reader is None:
+                reader = connect(args.name)
+        
+        snapshot = None
+        if reader is not None and reader.published() != last_published:
+            last_published = reader.published()
+            snapshot = reader.latest()
+        
+        # Solo se redibuja cuando hay un snapshot nuevo
+        if snapshot is not None:
+            screen.fill(BACKGROUND_COLOR)
+            draw_snapshot(screen, sprites, font, small_font, hud, snapshot)
+            pygame.display.flip()
+        elif reader is None:
+            screen.fill(BACKGROUND_COLOR)
+            hud.draw_text(screen, font, f"Esperando el entrenamiento '{args.name}'...", (80, 80))
+            pygame.display.flip()
+        clock.tick(args.fps)
+    
+    if reader is not None:
+        reader.close()
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
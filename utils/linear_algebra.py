@@ -24,6 +24,74 @@ def matrix_vector_multiplication(matrix, vector):
     return result
 
 
+def vectorized_matrix_vector_multiplication(matrix, vector, out=None):
+    """
+    Versión vectorizada de matrix_vector_multiplication.
+    
+    Multiplica todos los elementos de una vez y suma cada fila con una
+    suma acumulada, que recorre las columnas en el mismo orden que la
+    versión con bucles, así que el resultado es idéntico bit a bit.
+    
+    Args:
+        matrix: numpy array 2D (filas, columnas)
+        vector: numpy array 1D (columnas)
+        out: numpy array 1D (filas) opcional donde escribir el resultado
+    
+    Returns:
+        numpy array 1D con el resultado
+    """
+    products = np.multiply(matrix, vector, dtype=float)
+    np.cumsum(products, axis=1, out=products)
+    if out is None:
+        return products[:, -1].copy()
+    out[:] = products[:, -1]
+    return out
+
+
+def batched_matrix_vector_multiplication(matrices, vectors, out=None):
+    """
+    Multiplica cada matriz de un lote por su vector correspondiente.
+    
+    Acumula las columnas en el mismo orden que matrix_vector_multiplication,
+    así que cada resultado es idéntico bit a bit al de la versión por filas.
+    Los vectores pueden tener dimensiones extra al principio (p. ej. varias
+    copias de la población): cada matriz se aplica a todos sus vectores sin
+    copiarla.
+    
+    Args:
+        matrices: numpy array 3D (n, filas, columnas)
+        vectors: numpy array (..., n, columnas)
+        out: numpy array (..., n, filas) opcional donde escribir el resultado
+    
+    Returns:
+        numpy array (..., n, filas) con los resultados
+    """
+    out = np.multiply(matrices[:, :, 0], vectors[..., 0, None], out=out)
+    if matrices.shape[2] > 1:
+        product = np.empty_like(out)
+        for j in range(1, matrices.shape[2]):
+            np.multiply(matrices[:, :, j], vectors[..., j, None], out=product)
+            out += product
+    return out
+
+
+def add_bias_relu(values, bias, out=None):
+    """
+    Suma el bias y aplica ReLU en una sola pasada sobre los datos.
+    
+    Args:
+        values: numpy array (..., n) con los valores de la capa
+        bias: numpy array (..., n) o (n,) con los bias
+        out: numpy array opcional donde escribir el resultado
+             (puede ser el propio values para operar en sitio)
+    
+    Returns:
+        numpy array con max(0, values + bias)
+    """
+    out = np.add(values, bias, out=out)
+    return np.maximum(out, 0, out=out)
+
+
 def zeroes_matrix(rows, cols):
     """
     Crea una matriz de ceros.
@@ -38,14 +106,17 @@ def zeroes_matrix(rows, cols):
     return np.zeros((rows, cols))
 
 
-def random_vector(size):
+def random_vector(size, rng=None):
     """
     Crea un vector con valores aleatorios entre -1 y 1.
     
     Args:
         size: tamaño del vector
+        rng: numpy.random.Generator opcional (por defecto, el global de numpy)
     
     Returns:
         numpy array 1D con valores aleatorios
     """
-    return np.random.uniform(-1, 1, size)
\ No newline at end of file
+    if rng is None:
+        rng = np.random
+    return rng.uniform(-1, 1, size)
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Registro en disco de las estadísticas de cada generación (CSV o JSONL).
+"""
+import os
+import csv
+import json
+
+
+# Columnas de cada generación, en orden
+METRIC_COLUMNS = ("generation", "max_score", "avg_score", "min_score", "variance", "std",
+                  "wall_seconds", "evaluations_per_second")
+
+
+def is_jsonl(path):
+    """True si la ruta es un JSONL (.jsonl/.json) y False si es un CSV."""
+    return path.lower().endswith((".jsonl", ".json"))
+
+
+class MetricsLog:
+    """
+    Añade una línea por generación a un archivo CSV o JSONL (según la
+    extensión) en cuanto termina la generación. El archivo tiene buffer de
+    línea, así que otro proceso puede leerlo mientras se escribe, y se abre
+    en modo append para continuar un entrenamiento reanudado.
+    """
+    
+    def __init__(self, path):
+        """
+        Args:
+            path: archivo .csv o .jsonl
+        """
+        self.path = path
+        self.jsonl = is_jsonl(path)
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, "a", buffering=1, newline="", encoding="utf-8")
+        if not self.jsonl:
+            self.writer = csv.writer(self.file, lineterminator="\n")
+            if new_file:
+                self.writer.writerow(METRIC_COLUMNS)
+    
+    def write(self, stats):
+        """
+        Escribe las estadísticas de una generación.
+        
+        Args:
+            stats: dict con las columnas de METRIC_COLUMNS
+        """
+        if self.jsonl:
+            self.file.write(json.dumps({column: stats[column] for column in METRIC_COLUMNS}) + "\n")
+        else:
+            self.writer.writerow([stats[column] for column in METRIC_COLUMNS])
+    
+    def close(self):
+        """Cierra el archivo."""
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class MetricsTail:
+    """
+    Lee incrementalmente un archivo de MetricsLog que todavía se está
+    escribiendo: cada llamada a poll devuelve solo las generaciones nuevas.
+    """
+    
+    def __init__(self, path):
+        """
+        Args:
+            path: archivo .csv o .jsonl
+        """
+        self.path = path
+        self.jsonl = is_jsonl(path)
+        self.offset = 0
+        self.pending = ""
+        self.columns = None if not self.jsonl else METRIC_COLUMNS
+    
+    def poll(self):
+        """
+        Returns:
+            list: dicts de las generaciones escritas desde la última llamada
+        """
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as file:
+            file.seek(self.offset)
+            chunk = file.read()
+            self.offset = file.tell()
+        
+        # La última línea puede estar a medio escribir: se guarda para la próxima vez
+        lines = (self.pending + chunk).split("\n")
+        self.pending = lines.pop()
+        records = []
+        for line in lines:
+            if not line:
+                continue
+            if self.jsonl:
+                records.append(json.loads(line))
+            elif self.columns is None:
+                self.columns = next(csv.reader([line]))
+            else:
+                values = next(csv.reader([line]))
+                records.append({column: float(value) for column, value in zip(self.columns, values)})
+        return records
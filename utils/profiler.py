@@ -0,0 +1,178 @@
+"""
+Medición de tiempos por fase del bucle de simulación.
+"""
+import csv
+import json
+import time
+from collections import defaultdict
+import numpy as np
+
+
+# Cubetas del histograma: la cubeta b cuenta duraciones de [2^(b-1), 2^b) ns
+HISTOGRAM_BUCKETS = 48
+
+
+class PhaseStats:
+    """
+    Contadores de una fase: número de mediciones, tiempo total, mínimo,
+    máximo e histograma logarítmico (en base 2) de las duraciones.
+    """
+    
+    def __init__(self, samples=()):
+        """
+        Args:
+            samples: duraciones en nanosegundos
+        """
+        samples = np.asarray(samples, dtype=np.int64)
+        self.count = len(samples)
+        self.total_ns = int(samples.sum())
+        self.min_ns = int(samples.min()) if self.count else 0
+        self.max_ns = int(samples.max()) if self.count else 0
+        # frexp da el exponente e con x = m * 2^e, m en [0.5, 1): la longitud en bits
+        buckets = np.minimum(np.frexp(samples.astype(float))[1], HISTOGRAM_BUCKETS - 1)
+        self.histogram = np.bincount(buckets, minlength=HISTOGRAM_BUCKETS)
+    
+    def merge(self, other):
+        """Acumula los contadores de otra fase."""
+        if other.count and (not self.count or other.min_ns < self.min_ns):
+            self.min_ns = other.min_ns
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.histogram = self.histogram + other.histogram
+    
+    def to_dict(self):
+        """
+        Returns:
+            dict: contadores en milisegundos/microsegundos e histograma
+        """
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+            "min_us": self.min_ns / 1e3,
+            "max_us": self.max_ns / 1e3,
+            "histogram_ns_log2": self.histogram.tolist(),
+        }
+
+
+class Profiler:
+    """
+    Cronómetro por fases con muy poco coste.
+    Uso dentro de un frame:
+        start = profiler.clock()
+        ...fase A...
+        start = profiler.lap("a", start)
+        ...fase B...
+        profiler.lap("b", start)
+    Cada medición solo se añade a una lista; los contadores e histogramas
+    se calculan al cerrar la generación. Desactivado, clock y lap solo
+    devuelven 0. Se puede activar o desactivar en cualquier momento con el
+    atributo enabled.
+    """
+    
+    def __init__(self, enabled=False):
+        """
+        Args:
+            enabled: si empieza midiendo
+        """
+        self.enabled = enabled
+        self.samples = defaultdict(list)
+        self.generations = []
+    
+    def clock(self):
+        """
+        Returns:
+            int: instante actual en ns (0 si está desactivado)
+        """
+        if not self.enabled:
+            return 0
+        return time.perf_counter_ns()
+    
+    def lap(self, phase, start):
+        """
+        Registra el tiempo transcurrido desde start en una fase.
+        
+        Args:
+            phase: nombre de la fase
+            start: instante devuelto por clock o por el lap anterior
+        
+        Returns:
+            int: instante actual, para encadenar la siguiente fase
+        """
+        if not self.enabled:
+            return 0
+        now = time.perf_counter_ns()
+        # Si se activó a mitad de frame, start es 0 y la medición no vale
+        if start:
+            self.samples[phase].append(now - start)
+        return now
+    
+    def end_generation(self, generation):
+        """
+        Cierra los contadores de una generación y empieza otros nuevos.
+        
+        Args:
+            generation: número de la generación terminada
+        """
+        if self.samples:
+            self.generations.append((generation, self.phase_stats()))
+        self.samples = defaultdict(list)
+    
+    def phase_stats(self):
+        """
+        Returns:
+            dict: fase -> PhaseStats de la generación en curso
+        """
+        return {phase: PhaseStats(samples) for phase, samples in self.samples.items()}
+    
+    def totals(self):
+        """
+        Returns:
+            dict: fase -> PhaseStats acumulado de toda la ejecución
+        """
+        totals = {}
+        for _, phases in self.generations + [(None, self.phase_stats())]:
+            for phase, stats in phases.items():
+                totals.setdefault(phase, PhaseStats()).merge(stats)
+        return totals
+    
+    def to_dict(self):
+        """
+        Returns:
+            dict: totales por fase y contadores de cada generación
+        """
+        return {
+            "totals": {phase: stats.to_dict() for phase, stats in self.totals().items()},
+            "generations": [{"generation": generation,
+                             "phases": {phase: stats.to_dict() for phase, stats in phases.items()}}
+                            for generation, phases in self.generations],
+        }
+    
+    def save_json(self, path):
+        """Exporta todos los contadores a un archivo JSON."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+    
+    def save_csv(self, path):
+        """
+        Exporta los contadores a un CSV con una fila por fase y generación
+        (generación vacía para los totales de la ejecución).
+        """
+        columns = ["generation", "phase", "count", "total_ms", "mean_us", "min_us", "max_us"]
+        rows = [(None, self.totals())] + self.generations
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            for generation, phases in rows:
+                for phase, stats in phases.items():
+                    values = stats.to_dict()
+                    writer.writerow(["" if generation is None else generation, phase] +
+                                    [values[column] for column in columns[2:]])
+    
+    def save(self, path):
+        """Exporta a CSV si la ruta termina en .csv y a JSON en otro caso."""
+        if path.lower().endswith(".csv"):
+            self.save_csv(path)
+        else:
+            self.save_json(path)
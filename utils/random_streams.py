@@ -0,0 +1,90 @@
+"""
+Generadores aleatorios independientes y reproducibles a partir de una semilla.
+"""
+import numpy as np
+
+
+# Clave de cada flujo dentro de la semilla raíz
+COURSE_STREAM = 0
+GENOME_STREAM = 1
+MUTATION_STREAM = 2
+SELECTION_STREAM = 3
+PLACEMENT_STREAM = 4
+
+
+# Flujos cuyo estado avanza durante la ejecución (el recorrido se recrea por generación)
+STATEFUL_STREAMS = ("genome", "mutation", "selection", "placement")
+
+
+class RandomStreams:
+    """
+    Divide una semilla en flujos aleatorios independientes:
+    - course: recorrido de obstáculos (uno distinto por generación)
+    - genome: genomas iniciales y dinosaurios completamente nuevos
+    - mutation: mutaciones y crossover
+    - selection: selección de padres
+    - placement: posición x de los dinosaurios
+    Con la misma semilla, todos los flujos producen exactamente los mismos valores.
+    """
+    
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed: semilla entera (por defecto, una aleatoria del sistema operativo)
+        """
+        root = np.random.SeedSequence(seed)
+        # Semilla efectiva: permite reproducir la ejecución aunque no se haya dado una
+        self.seed = root.entropy
+        self.genome = self.stream(GENOME_STREAM)
+        self.mutation = self.stream(MUTATION_STREAM)
+        self.selection = self.stream(SELECTION_STREAM)
+        self.placement = self.stream(PLACEMENT_STREAM)
+    
+    def stream(self, *key):
+        """
+        Crea el generador de un flujo.
+        
+        Args:
+            key: identificador del flujo (p. ej. COURSE_STREAM, generación)
+        
+        Returns:
+            numpy.random.Generator
+        """
+        return np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=key))
+    
+    def course(self, generation, index=0):
+        """
+        Generador del recorrido de obstáculos de una generación.
+        Solo depende de la semilla, la generación y el índice, así que
+        cualquier proceso puede reconstruir el mismo recorrido.
+        
+        Args:
+            generation: número de la generación
+            index: recorrido dentro de la generación cuando se juegan varios
+                (el 0 es el recorrido de siempre)
+        
+        Returns:
+            numpy.random.Generator
+        """
+        if index == 0:
+            return self.stream(COURSE_STREAM, generation)
+        return self.stream(COURSE_STREAM, generation, index)
+    
+    def get_state(self):
+        """
+        Estado actual de los flujos que avanzan durante la ejecución.
+        
+        Returns:
+            dict: nombre del flujo -> estado del bit generator
+        """
+        return {name: getattr(self, name).bit_generator.state for name in STATEFUL_STREAMS}
+    
+    def set_state(self, state):
+        """
+        Restaura el estado guardado con get_state.
+        
+        Args:
+            state: dict devuelto por get_state
+        """
+        for name in STATEFUL_STREAMS:
+            getattr(self, name).bit_generator.state = state[name]